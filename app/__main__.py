@@ -0,0 +1,72 @@
+"""Production entry point: ``python -m app``.
+
+Server tuning comes from `Settings` (SERVER_*); command-line flags override
+it for one run. Examples:
+
+    python -m app
+    python -m app --workers 4 --port 8080
+"""
+import argparse
+import importlib.util
+import logging
+
+import uvicorn
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve_loop(choice: str) -> str:
+    if choice == "auto":
+        return "uvloop" if _installed("uvloop") else "asyncio"
+    return choice
+
+
+def resolve_http(choice: str) -> str:
+    if choice == "auto":
+        return "httptools" if _installed("httptools") else "h11"
+    return choice
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the API server.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default=settings.SERVER_LOOP)
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], default=settings.SERVER_HTTP)
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS, help="keep-alive timeout (s)")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS, help="drain time on shutdown (s)")
+    return parser.parse_args(argv)
+
+
+def server_options(args: argparse.Namespace) -> dict:
+    """uvicorn.run() keyword arguments for the parsed command line."""
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers,
+        "loop": resolve_loop(args.loop),
+        "http": resolve_http(args.http),
+        "timeout_keep_alive": args.keepalive,
+        "backlog": args.backlog,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "lifespan": "on",
+    }
+
+
+def main(argv=None) -> None:
+    options = server_options(parse_args(argv))
+    logger.info("Starting %s with %s", settings.APP_NAME, options)
+    # Workers re-import the app, so it must be given as an import string.
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,158 @@ class Settings(BaseSettings):
     # Support key rotation via JWT_KEYS and an ACTIVE_KEY_ID.
     JWT_KEYS: dict = {"key-1": "change-me"}
     ACTIVE_KEY_ID: str = "key-1"
-    JWT_ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: str = Field("HS256", pattern="^(HS256|EdDSA|RS256)$")
+    # EdDSA / RS256 signing keys by kid (PEM text or a PEM file path), and
+    # verification-only public keys kept published during rotation. See
+    # app/services/jwt_keys.py.
+    JWT_PRIVATE_KEYS: dict = {}
+    JWT_PUBLIC_KEYS: dict = {}
+    # Cache lifetime of /.well-known/jwks.json; publish a new key at least
+    # this long before making it active.
+    JWKS_CACHE_SECONDS: int = 3600
     JWT_AUDIENCE: str = "weq-api"
     JWT_ISSUER: str = "weq-auth-service"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # default to 30 minutes for access tokens
 
+    # Admission control: per route-group concurrency limits with a bounded
+    # wait queue. Requests beyond the queue are shed with a 503. Groups with
+    # a target latency adapt their limit (AIMD) to the measured latency.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: dict = {"health": 4, "auth": 8, "notes": 32, "admin": 2, "default": 64}
+    ADMISSION_ROUTES: dict = {
+        "/health": "health",
+        "/auth/token": "auth",
+        "/auth/register": "auth",
+        "/notes": "notes",
+        "/admin": "admin",
+    }
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_TARGET_LATENCY_MS: dict = {"auth": 1000, "notes": 250, "default": 250}
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Length (in characters) of `content_preview` on note endpoints.
+    NOTES_PREVIEW_LENGTH: int = 200
+    # Most ids one `/notes/batch` call may request.
+    NOTES_BATCH_MAX_IDS: int = 500
+    # Note content of at least NOTES_COMPRESSION_MIN_BYTES is stored
+    # compressed (see app/utils/content_codec.py); "none" stores new rows as
+    # plain text. Existing rows are rewritten by
+    # `python -m app.tools.recompress_notes`.
+    NOTES_COMPRESSION: str = Field("zlib", pattern="^(none|zlib|lzma)$")
+    NOTES_COMPRESSION_MIN_BYTES: int = 1024
+    NOTES_COMPRESSION_LEVEL: int = Field(6, ge=0, le=9)
+    # Notes older than NOTES_ARCHIVE_AFTER_DAYS are moved to `notes_archive`
+    # every NOTES_ARCHIVE_INTERVAL_SECONDS, NOTES_ARCHIVE_BATCH_SIZE rows per
+    # transaction, so `notes` and its indexes only hold recent history.
+    # Reads cover both tables (see app/services/note_archiver.py). Off by
+    # default because every process that enables it starts its own archiver:
+    # with SERVER_WORKERS > 1, enable it in exactly one worker or run a
+    # separate single-worker instance with it on.
+    NOTES_ARCHIVE_ENABLED: bool = False
+    NOTES_ARCHIVE_AFTER_DAYS: int = Field(365, ge=1)
+    NOTES_ARCHIVE_BATCH_SIZE: int = 500
+    NOTES_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+
+    # Single-flight coalescing of identical concurrent reads. A TTL > 0 also
+    # keeps the shared result for that many seconds after it completes.
+    SINGLE_FLIGHT_TTL_SECONDS: float = 0.0
+
+    # Response compression (gzip, plus br when `brotli` is installed). Bodies
+    # below the threshold are sent as-is. Static paths reuse the compressed
+    # constant prefix of their body across requests (routed responses only:
+    # with PROBE_FAST_PATH_ENABLED, /service/info never reaches this layer).
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_STATIC_PATHS: list[str] = ["/service/info"]
+
+    # Serve /health* and /service/info from pre-encoded bodies, bypassing
+    # routing and the middleware stack. Turned off, /service/info is routed
+    # again through the single-flight and the static compression cache.
+    PROBE_FAST_PATH_ENABLED: bool = True
+
+    # Background DB health checks behind /health/ready. The worker reports
+    # unready when the check fails, or its latency / pool checkout wait
+    # exceeds the limits.
+    DB_PROBE_ENABLED: bool = True
+    DB_PROBE_INTERVAL_SECONDS: float = 5.0
+    DB_PROBE_TIMEOUT_SECONDS: float = 1.0
+    DB_PROBE_MAX_LATENCY_MS: float = 500.0
+    DB_PROBE_MAX_CHECKOUT_MS: float = 250.0
+
+    # Runtime diagnostics (event-loop lag, pool usage, GC pauses, memory)
+    # served to ADMIN_SUBJECTS on /internal/diagnostics and /internal/metrics.
+    DIAGNOSTICS_ENABLED: bool = True
+    DIAGNOSTICS_LOOP_LAG_INTERVAL_SECONDS: float = 0.25
+
+    # Opt-in watchdog thread that logs the loop thread's stack (with route
+    # and request id) whenever the event loop stalls longer than the
+    # threshold, and counts stalls per call site.
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_MS: float = 100.0
+
+    # Per-request profiling: requests from ADMIN_SUBJECTS carrying
+    # `X-Profile: 1` are profiled (see app/middleware/profiling.py).
+    # Profiles are saved as `<request_id>.pstats` under PROFILING_DIR, which
+    # keeps only the PROFILING_MAX_FILES newest.
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 50
+
+    # SQL statement timing. Statements slower than SQL_SLOW_QUERY_MS are
+    # logged with the request id (and the SQLite query plan when
+    # SQL_EXPLAIN_SLOW_QUERIES is set); requests issuing more than
+    # SQL_MAX_QUERIES_PER_REQUEST statements are logged too.
+    SQL_SLOW_QUERY_MS: float = 100.0
+    SQL_EXPLAIN_SLOW_QUERIES: bool = False
+    SQL_MAX_QUERIES_PER_REQUEST: int = 10
+
+    # Server tuning for `python -m app`. "auto" picks uvloop / httptools
+    # when installed. On shutdown in-flight requests get up to
+    # SERVER_GRACEFUL_SHUTDOWN_SECONDS to finish. With SERVER_PREWARM each
+    # worker opens a DB connection and exercises the password and JWT code
+    # before it accepts traffic.
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_LOOP: str = Field("auto", pattern="^(auto|asyncio|uvloop)$")
+    SERVER_HTTP: str = Field("auto", pattern="^(auto|h11|httptools)$")
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_PREWARM: bool = True
+
+    # Auth audit trail: events are queued in memory and written to
+    # `auth_events` in batches of AUDIT_BATCH_SIZE, or every
+    # AUDIT_FLUSH_INTERVAL_SECONDS. Events beyond AUDIT_QUEUE_SIZE are
+    # dropped and counted.
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 100
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Password hashing cost, pinned per scheme: bcrypt's is log2 rounds;
+    # sha256_crypt (used when bcrypt is unusable) takes linear rounds.
+    # `python -m app.tools.calibrate_password_hashing` suggests values that
+    # make a verify take PASSWORD_TARGET_VERIFY_MS on the current machine.
+    # Hashes at another cost are rehashed in the background after the next
+    # successful login when PASSWORD_REHASH_ON_LOGIN is set.
+    PASSWORD_BCRYPT_ROUNDS: int = Field(12, ge=4, le=31)
+    PASSWORD_SHA256_ROUNDS: int = Field(535000, ge=1000, le=999999999)
+    PASSWORD_TARGET_VERIFY_MS: float = 250.0
+    PASSWORD_REHASH_ON_LOGIN: bool = True
+
+    # Token subjects (usernames / emails) allowed on the /admin and /internal
+    # endpoints.
+    ADMIN_SUBJECTS: list[str] = []
+    # Bulk user import (`python -m app.tools.import_users`, POST
+    # /admin/users/import): passwords are hashed across USER_IMPORT_WORKERS
+    # processes (0 = one per CPU) and users are inserted in transactions of
+    # USER_IMPORT_CHUNK_SIZE rows.
+    USER_IMPORT_WORKERS: int = 0
+    USER_IMPORT_CHUNK_SIZE: int = 500
+
     model_config = ConfigDict(env_file=".env")
 
 
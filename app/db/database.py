@@ -1,12 +1,15 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.db.instrumentation import instrument_engine
+
 DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
 )
+instrument_engine(engine)
 
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -0,0 +1,195 @@
+import bisect
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import settings
+from app.utils import metrics, request_context
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Collapse literals and IN-lists so equivalent statements group together."""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _PARAM_LIST.sub("(?, ...)", text)
+
+
+def _histogram_bucket(ms: float) -> int:
+    return bisect.bisect_left(LATENCY_BUCKETS_MS, ms)
+
+
+class QueryStats:
+    """Per-fingerprint statement counts and latency histograms, plus the
+    number of statements each route issues per request.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = settings.SQL_SLOW_QUERY_MS,
+        explain_slow: bool = settings.SQL_EXPLAIN_SLOW_QUERIES,
+        max_queries_per_request: int = settings.SQL_MAX_QUERIES_PER_REQUEST,
+        max_fingerprints: int = 500,
+    ):
+        self.slow_ms = slow_ms
+        self.explain_slow = explain_slow
+        self.max_queries_per_request = max_queries_per_request
+        self.max_fingerprints = max_fingerprints
+        self.statements: Dict[str, dict] = {}
+        self.routes: Dict[str, dict] = {}
+        self.slow_queries = 0
+        self._fingerprints: Dict[str, str] = {}
+
+    def _fingerprint(self, statement: str) -> str:
+        # Statements come from compiled SQLAlchemy constructs, so the same
+        # few strings repeat; remember their fingerprints.
+        fp = self._fingerprints.get(statement)
+        if fp is None:
+            fp = fingerprint(statement)
+            if len(self._fingerprints) < 4 * self.max_fingerprints:
+                self._fingerprints[statement] = fp
+        return fp
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> str:
+        fp = self._fingerprint(statement)
+        entry = self.statements.get(fp)
+        if entry is None:
+            if len(self.statements) >= self.max_fingerprints:
+                fp = "<other>"
+                entry = self.statements.get(fp)
+            if entry is None:
+                entry = self.statements[fp] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["buckets"][_histogram_bucket(elapsed_ms)] += 1
+        if elapsed_ms >= self.slow_ms:
+            self.slow_queries += 1
+        return fp
+
+    def record_request(self, route: Optional[str], queries: int, request_id: Optional[str] = None) -> None:
+        """Count statements per request and flag routes that issue too many."""
+        route = route or "<unmatched>"
+        entry = self.routes.get(route)
+        if entry is None:
+            if len(self.routes) >= self.max_fingerprints:
+                return
+            entry = self.routes[route] = {"requests": 0, "queries": 0, "max_queries": 0, "over_limit": 0}
+        entry["requests"] += 1
+        entry["queries"] += queries
+        entry["max_queries"] = max(entry["max_queries"], queries)
+        if queries > self.max_queries_per_request:
+            entry["over_limit"] += 1
+            logger.warning(
+                "%s issued %d SQL statements in one request (limit %d, request_id=%s)",
+                route, queries, self.max_queries_per_request, request_id,
+            )
+
+    def stats(self) -> dict:
+        top = sorted(self.statements.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "slow_query_ms": self.slow_ms,
+            "slow_queries": self.slow_queries,
+            "bucket_bounds_ms": list(LATENCY_BUCKETS_MS),
+            "statements": {
+                fp: {
+                    **entry,
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                    "total_ms": round(entry["total_ms"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "buckets": list(entry["buckets"]),
+                }
+                for fp, entry in top[:50]
+            },
+            "per_request": {
+                route: {**entry, "avg_queries": round(entry["queries"] / entry["requests"], 2)}
+                for route, entry in self.routes.items()
+            },
+        }
+
+
+query_stats = QueryStats()
+metrics.register("sql", query_stats.stats)
+
+
+def _explain(conn, statement: str, parameters) -> Optional[list]:
+    """SQLite query plan for a slow SELECT, via a raw cursor so it is not
+    itself instrumented. Best effort: any failure yields None.
+    """
+    if conn.dialect.name != "sqlite" or not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[-1] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    ctx = request_context.current()
+    if ctx is not None:
+        ctx.db_time += elapsed
+        ctx.db_queries += 1
+
+    elapsed_ms = elapsed * 1000
+    fp = query_stats.record_statement(statement, elapsed_ms)
+    if elapsed_ms >= query_stats.slow_ms:
+        plan = None
+        if query_stats.explain_slow and not executemany:
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query: %.1f ms (request_id=%s) %s%s",
+            elapsed_ms,
+            ctx.request_id if ctx is not None else None,
+            fp,
+            f" | plan: {'; '.join(plan)}" if plan else "",
+        )
+
+
+def _handle_error(context):
+    # after_cursor_execute does not run for a failed statement; drop its
+    # start time so the stack does not grow on a pooled connection.
+    if context.execution_context is not None and context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement on `engine`: per-fingerprint stats, the slow-query
+    log, and the current request's DB time and statement count.
+    """
+    target = engine.sync_engine
+    if event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.db.database import Base
+from app.db.instrumentation import instrument_engine
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_notes.db"
 
@@ -8,6 +9,7 @@ engine_test = create_async_engine(
     TEST_DATABASE_URL,
     echo=False,
 )
+instrument_engine(engine_test)
 
 AsyncSessionTest = sessionmaker(
     engine_test,
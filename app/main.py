@@ -3,9 +3,23 @@ from contextlib import asynccontextmanager
 
 from app.config.settings import settings
 from app.middleware.security import SecurityMiddleware
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.probes import ProbeFastPathMiddleware
 from app.middleware.error_handler import error_handler
 
-from app.db.database import engine, Base
+from app.db.database import engine, Base, AsyncSessionLocal
+from app.repositories.note_stats_repository import NoteStatsRepository
+from app.services.db_probe import db_probe
+from app.services.diagnostics import diagnostics
+from app.services.loop_watchdog import loop_watchdog
+from app.services.prewarm import prewarm
+from app.services.audit_trail import audit_trail
+from app.services.note_archiver import note_archiver
+from app.services.password_rehash import password_rehasher
+from app.services.user_import import import_pool
+from app.utils.response import TimedJSONResponse
 from sqlalchemy import text
 
 
@@ -34,7 +48,49 @@ async def lifespan(app: FastAPI):
                 pass
 
         await conn.run_sync(_ensure_user_columns)
+
+        # Same for note ownership: `notes.user_id` and the per-user listing
+        # index (create_all only builds indexes for tables it creates).
+        def _ensure_note_columns(sync_conn):
+            try:
+                res = sync_conn.execute(text("PRAGMA table_info('notes')"))
+                existing = {row[1] for row in res.fetchall()}
+                if 'user_id' not in existing:
+                    sync_conn.execute(text("ALTER TABLE notes ADD COLUMN user_id INTEGER REFERENCES users(id)"))
+                sync_conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_notes_user_created_id ON notes (user_id, created_at, id)"
+                ))
+            except Exception:
+                pass
+
+        await conn.run_sync(_ensure_note_columns)
+
+    # Databases created before the note counters existed get them built once.
+    async with AsyncSessionLocal() as session:
+        await NoteStatsRepository.initialize(session)
+
+    if settings.SERVER_PREWARM:
+        await prewarm(engine)
+    if settings.DB_PROBE_ENABLED:
+        await db_probe.start()
+    if settings.DIAGNOSTICS_ENABLED:
+        diagnostics.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    if settings.AUDIT_ENABLED:
+        audit_trail.start()
+    if settings.NOTES_ARCHIVE_ENABLED:
+        note_archiver.start()
     yield
+    await note_archiver.stop()
+    await password_rehasher.drain()
+    await import_pool.shutdown()
+    await audit_trail.stop()
+    await loop_watchdog.stop()
+    await diagnostics.stop()
+    await db_probe.stop()
+    # uvicorn has drained in-flight requests by now; close pooled connections.
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -42,10 +98,25 @@ app = FastAPI(
     docs_url=None if settings.ENV == "prod" else "/docs",
     redoc_url=None if settings.ENV == "prod" else "/redoc",
     lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
+# Profiling is innermost so the profile and Server-Timing cover only the
+# handler, not time spent queued for admission.
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Admission control sits inside SecurityMiddleware so shed responses still
+# carry the request id and security headers.
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
 app.add_middleware(SecurityMiddleware)
 app.middleware("http")(error_handler)
+# Outside the error handler so sanitized errors can be compressed too.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+# Probes are answered before anything else runs (see app/middleware/probes.py).
+if settings.PROBE_FAST_PATH_ENABLED:
+    app.add_middleware(ProbeFastPathMiddleware)
 
 
 @app.get("/boom")
@@ -61,9 +132,11 @@ from app.routers import health, service
 
 app.include_router(health.router)
 app.include_router(service.router)
-from app.routers import note, protected, auth
+from app.routers import note, protected, auth, internal, admin
 
 app.include_router(protected.router)
+app.include_router(internal.router)
+app.include_router(admin.router)
 app.include_router(auth.router)
 
 app.include_router(note.router)
@@ -0,0 +1,49 @@
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from fastapi.responses import JSONResponse
+
+from app.config.settings import settings
+from app.utils import metrics
+from app.utils.admission import AdmissionController
+
+
+controller = AdmissionController(
+    limits=settings.ADMISSION_LIMITS,
+    routes=settings.ADMISSION_ROUTES,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    target_latency_ms=settings.ADMISSION_TARGET_LATENCY_MS,
+)
+metrics.register("admission", controller.stats)
+
+
+class AdmissionMiddleware(BaseHTTPMiddleware):
+    """Bound concurrency per route group and shed excess load with 503s."""
+
+    def __init__(self, app, controller: AdmissionController = controller):
+        super().__init__(app)
+        self.controller = controller
+
+    async def dispatch(self, request: Request, call_next):
+        limiter = self.controller.limiter_for(request.url.path)
+        if limiter is None:
+            return await call_next(request)
+
+        if not await limiter.acquire():
+            request_id = getattr(request.state, "request_id", None)
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Service overloaded", "request_id": request_id},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+
+        start = time.perf_counter()
+        latency = None
+        try:
+            response = await call_next(request)
+            latency = time.perf_counter() - start
+            return response
+        finally:
+            # Failed requests release without feeding the latency estimate.
+            limiter.release(latency)
@@ -0,0 +1,244 @@
+import os
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.utils import metrics
+
+try:  # optional: Brotli is used when installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+class _ZlibEncoder:
+    def __init__(self, level: int, wbits: int = 31, mem_level: int = 8):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, wbits, mem_level)
+
+    @classmethod
+    def sized(cls, level: int, size: int) -> "_ZlibEncoder":
+        """Encoder whose window just covers ``size`` bytes, so copy() is cheap."""
+        window_bits = min(15, max(9, (size - 1).bit_length()))
+        return cls(level, wbits=16 + window_bits, mem_level=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        # Sync flush so each streamed chunk reaches the client promptly.
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+    def copy(self) -> "_ZlibEncoder":
+        clone = _ZlibEncoder.__new__(_ZlibEncoder)
+        clone._c = self._c.copy()
+        return clone
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        # Brotli quality runs 0-11; map the shared 1-9 level onto it.
+        self._c = brotli.Compressor(quality=min(11, max(0, level)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+    copy = None  # brotli compressors cannot be cloned
+
+
+ENCODERS: Dict[str, Callable[[int], object]] = {"gzip": _ZlibEncoder}
+if brotli is not None:  # pragma: no cover - depends on environment
+    ENCODERS = {"br": _BrotliEncoder, **ENCODERS}
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    offered: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODERS:  # server preference order
+        q = offered.get(encoding, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class StaticBodyCache:
+    """Compress the constant prefix of a path's body once and reuse it.
+
+    Static-path bodies such as ``/service/info`` only differ per request by
+    the trailing ``request_id``. The cache learns the prefix shared by
+    consecutive bodies, compresses it once and keeps a snapshot of the
+    compressor state. Later bodies clone that state and only compress their
+    own tail. Only gzip takes part; other encodings compress in full.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._last_body: Dict[Tuple[str, str], bytes] = {}
+        self._prefixes: Dict[Tuple[str, str], Tuple[bytes, bytes, _ZlibEncoder]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, path: str, encoding: str, body: bytes, level: int) -> bytes:
+        if encoding != "gzip":
+            encoder = ENCODERS[encoding](level)
+            return encoder.compress(body) + encoder.finish()
+
+        key = (path, level)
+        entry = self._prefixes.get(key)
+        if entry is not None and body.startswith(entry[0]):
+            prefix, head, state = entry
+            self.hits += 1
+            encoder = state.copy()
+            return head + encoder.compress(body[len(prefix):]) + encoder.finish()
+
+        self.misses += 1
+        # Shrink a known prefix rather than relearning it, so it converges on
+        # the truly constant part even if two bodies shared a few extra bytes.
+        last = entry[0] if entry is not None else self._last_body.get(key)
+        if len(self._last_body) >= self.max_entries and key not in self._last_body:
+            self._last_body.clear()
+            self._prefixes.clear()
+        self._last_body[key] = body
+        prefix = os.path.commonprefix([last, body]) if last is not None else b""
+
+        # Leave headroom in the window for the per-request tail.
+        encoder = _ZlibEncoder.sized(level, 2 * len(body))
+        if not prefix:
+            return encoder.compress(body) + encoder.finish()
+
+        head = encoder.compress(prefix)
+        self._prefixes[key] = (prefix, head, encoder.copy())
+        return head + encoder.compress(body[len(prefix):]) + encoder.finish()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._prefixes)}
+
+
+static_cache = StaticBodyCache()
+metrics.register("compression.static_cache", static_cache.stats)
+
+
+class CompressionMiddleware:
+    """Negotiate Accept-Encoding and compress responses above a size threshold.
+
+    Responses with a known Content-Length are buffered and compressed in one
+    go (inner BaseHTTPMiddleware layers re-stream every body, so the chunk
+    framing alone says nothing about size). Responses without a length are
+    compressed chunk by chunk so they keep streaming.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        level: int = settings.COMPRESSION_LEVEL,
+        static_paths: tuple = tuple(settings.COMPRESSION_STATIC_PATHS),
+        cache: StaticBodyCache = static_cache,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.static_paths = frozenset(static_paths)
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        start_message: Message = {}
+        encoder = None
+        passthrough = False
+        sized = False
+        buffered: list = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough, sized
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                length = headers.get("content-length")
+                sized = length is not None
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+                    or (sized and int(length) < self.minimum_size)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if encoder is None and (sized or not more_body):
+                buffered.append(body)
+                if more_body:
+                    return
+                body = b"".join(buffered)
+                if len(body) < self.minimum_size:
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if path in self.static_paths:
+                    body = self.cache.compress(path, encoding, body, self.level)
+                else:
+                    enc = ENCODERS[encoding](self.level)
+                    body = enc.compress(body) + enc.finish()
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            if encoder is None:
+                # Streaming with unknown length.
+                encoder = ENCODERS[encoding](self.level)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+
+            chunk = encoder.compress(body)
+            chunk += encoder.flush() if more_body else encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,152 @@
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.routers.service import INFO_CACHE_CONTROL, service as info_service
+from app.services.db_probe import DatabaseProbe, db_probe
+from app.utils.http_cache import if_none_match
+
+_SLOT = re.compile(rb'"@(\w+)@"')
+
+# Same headers SecurityMiddleware adds to routed responses.
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+]
+
+
+def _dumps(content) -> bytes:
+    # Matches starlette's JSONResponse.render so bodies are byte-identical.
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def envelope(data) -> dict:
+    """`success_response` shape with a `request_id` slot."""
+    return {"success": True, "data": data, "request_id": "@request_id@"}
+
+
+class ProbeTemplate:
+    """A JSON body encoded once, with ``"@name@"`` string slots filled per request.
+
+    Slot values are spliced in as-is, so they must not need JSON escaping
+    (uuids and ISO timestamps are fine).
+    """
+
+    def __init__(self, content):
+        raw = _dumps(content)
+        self.parts: List[bytes] = _SLOT.split(raw)[::2]
+        self.slots: List[str] = [m.decode() for m in _SLOT.findall(raw)]
+
+    def render(self, values: Dict[str, str]) -> bytes:
+        out = [self.parts[0]]
+        for name, part in zip(self.slots, self.parts[1:]):
+            out.append(b'"' + values[name].encode() + b'"')
+            out.append(part)
+        return b"".join(out)
+
+
+class Probe:
+    """Serve one probe path straight from a pre-encoded template."""
+
+    def __init__(
+        self,
+        template: ProbeTemplate,
+        values: Optional[Callable[[], Dict[str, str]]] = None,
+        headers: Tuple[Tuple[bytes, bytes], ...] = (),
+        etag: Optional[str] = None,
+    ):
+        self.template = template
+        self.values = values
+        self.etag = etag
+        self.headers = [(b"content-type", b"application/json"), *_SECURITY_HEADERS, *headers]
+        if etag:
+            self.headers.append((b"etag", etag.encode()))
+
+    async def __call__(self, scope: Scope, send: Send) -> None:
+        request_id = str(uuid.uuid4())
+        headers = [*self.headers, (b"x-request-id", request_id.encode())]
+
+        if self.etag and if_none_match(_header(scope, b"if-none-match"), self.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        status, body = self.render(request_id)
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def render(self, request_id: str) -> Tuple[int, bytes]:
+        values = self.values() if self.values else {}
+        values["request_id"] = request_id
+        return 200, self.template.render(values)
+
+
+class ReadinessProbe(Probe):
+    """`/health/ready` from the DB probe's cached state: 200 or 503."""
+
+    def __init__(self, probe: DatabaseProbe):
+        super().__init__(ProbeTemplate(envelope({"status": "ready"})))
+        self.probe = probe
+        self.unready = ProbeTemplate(envelope({"status": "unready", "reason": "@reason@"}))
+
+    def render(self, request_id: str) -> Tuple[int, bytes]:
+        state = self.probe.status()
+        if state["status"] == "ready":
+            return 200, self.template.render({"request_id": request_id})
+        return 503, self.unready.render({"reason": state["reason"], "request_id": request_id})
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _now() -> Dict[str, str]:
+    return {"timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+def default_probes() -> Dict[str, Probe]:
+    """Fast-path versions of the health and service-info routes.
+
+    Bodies mirror `HealthService` / `ServiceInfoService`; the routed
+    endpoints stay in place for the OpenAPI docs and as the slow path.
+    """
+    return {
+        "/health": Probe(ProbeTemplate({"status": "ok"})),
+        "/health/ping": Probe(ProbeTemplate(envelope({"status": "ok"}))),
+        "/health/live": Probe(ProbeTemplate(envelope({"status": "live", "timestamp": "@timestamp@"})), values=_now),
+        "/health/ready": ReadinessProbe(db_probe),
+        "/service/info": Probe(
+            ProbeTemplate(envelope(info_service.info_payload())),
+            headers=((b"cache-control", INFO_CACHE_CONTROL.encode()),),
+            etag=info_service.etag(),
+        ),
+    }
+
+
+class ProbeFastPathMiddleware:
+    """Answer load-balancer probes before routing and dependency resolution.
+
+    Installed outermost, so a probe costs a dict lookup, a uuid and a byte
+    join instead of the middleware stack, routing and JSON encoding.
+    """
+
+    def __init__(self, app: ASGIApp, probes: Optional[Dict[str, Probe]] = None):
+        self.app = app
+        self.probes = default_probes() if probes is None else probes
+        self.enabled = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.enabled and scope["type"] == "http" and scope["method"] == "GET":
+            probe = self.probes.get(scope["path"])
+            if probe is not None:
+                await probe(scope, send)
+                return
+        await self.app(scope, receive, send)
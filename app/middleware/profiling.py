@@ -0,0 +1,119 @@
+import asyncio
+import cProfile
+import logging
+import os
+import time
+
+from fastapi import HTTPException
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.config.settings import settings
+from app.db.database import get_db
+from app.repositories.token_repository import TokenRepository
+from app.services.auth_service import decode_token
+from app.utils import request_context
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+async def profile_allowed(request: Request) -> bool:
+    """`X-Profile: 1` from a caller `require_admin` would admit.
+
+    Checked here rather than as a dependency because the profiler has to be
+    running before routing: a valid, unrevoked bearer token whose subject
+    is in ADMIN_SUBJECTS.
+    """
+    if request.headers.get(PROFILE_HEADER) != "1":
+        return False
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        subject = decode_token(token).get("sub")
+    except HTTPException:
+        return False
+    if subject not in settings.ADMIN_SUBJECTS:
+        return False
+    # The app's session dependency, so overrides (tests) apply here too.
+    sessions = request.app.dependency_overrides.get(get_db, get_db)()
+    try:
+        db = await sessions.__anext__()
+        return not await TokenRepository(db).is_revoked(token)
+    finally:
+        await sessions.aclose()
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Delete all but the `keep` newest profiles in `directory`."""
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pstats")]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def server_timing(ctx: request_context.RequestContext, total: float) -> str:
+    return (
+        f'db;dur={ctx.db_time * 1000:.2f};desc="{ctx.db_queries} queries", '
+        f"serialize;dur={ctx.serialize_time * 1000:.2f}, "
+        f"total;dur={total * 1000:.2f}"
+    )
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile a single request on demand.
+
+    Opted-in requests (see `profile_allowed`) run under cProfile; the stats
+    are written to `<directory>/<request_id>.pstats`, keeping the
+    `max_files` newest, and the response carries a `Server-Timing` header
+    with DB, serialization and total time. cProfile hooks the whole loop
+    thread, so one request is profiled at a time and concurrent opt-ins are
+    served unprofiled (`X-Profile: busy`).
+    """
+
+    def __init__(self, app, directory: str = settings.PROFILING_DIR, max_files: int = settings.PROFILING_MAX_FILES):
+        super().__init__(app)
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = asyncio.Lock()
+
+    def _save(self, profiler: cProfile.Profile, path: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(path)
+        _prune(self.directory, self.max_files)
+
+    async def dispatch(self, request: Request, call_next):
+        if not await profile_allowed(request):
+            return await call_next(request)
+        if self._lock.locked():
+            response = await call_next(request)
+            response.headers[PROFILE_HEADER] = "busy"
+            return response
+
+        async with self._lock:
+            ctx = request_context.current()
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+            total = time.perf_counter() - start
+
+            request_id = getattr(request.state, "request_id", None) or "unknown"
+            path = os.path.join(self.directory, f"{request_id}.pstats")
+            try:
+                await asyncio.to_thread(self._save, profiler, path)
+            except OSError as exc:
+                logger.warning("Could not save profile for request_id=%s: %s", request_id, exc)
+            else:
+                response.headers[PROFILE_HEADER] = f"{request_id}.pstats"
+            if ctx is not None:
+                response.headers["Server-Timing"] = server_timing(ctx, total)
+            return response
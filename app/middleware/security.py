@@ -2,6 +2,9 @@ import uuid
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+from app.db.instrumentation import query_stats
+from app.utils import request_context
+
 
 class SecurityMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -11,12 +14,20 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         # Add request ID to request state so it can be used in logging and error handling
         request.state.request_id = request_id
         
-        # Process the request
-        response = await call_next(request)
+        # Process the request; DB and serialization timings accumulate on the
+        # request context (see app/utils/request_context.py)
+        token = request_context.begin(request_id, request.url.path)
+        ctx = request_context.current()
+        try:
+            response = await call_next(request)
+        finally:
+            request_context.end(token)
+            route = request.scope.get("route")
+            query_stats.record_request(getattr(route, "path", None), ctx.db_queries, request_id)
         
         # Add security headers to response
         response.headers["X-Request-ID"] = request_id
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "DENY"
         
-        return response
\ No newline at end of file
+        return response
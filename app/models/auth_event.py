@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.database import Base
+
+
+class AuthEvent(Base):
+    __tablename__ = "auth_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event = Column(String, nullable=False, index=True)
+    subject = Column(String, nullable=True, index=True)
+    client_ip = Column(String, nullable=True)
+    detail = Column(String, nullable=True)
+    request_id = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
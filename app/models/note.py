@@ -1,12 +1,56 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import declared_attr
 from datetime import datetime
 from app.db.database import Base
+from app.utils import content_codec
 
 
-class Note(Base):
-    __tablename__ = "notes"
+class NoteFields:
+    """Columns shared by `notes` and `notes_archive`."""
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    content = Column(String, nullable=False)
+    # Stored value: TEXT, or a compressed BLOB for large content (see
+    # app/utils/content_codec.py). Use `content` for the text.
+    _content = Column("content", String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Nullable so rows created before ownership existed stay valid; they are
+    # simply not visible through the per-user endpoints.
+    @declared_attr
+    def user_id(cls):
+        return Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    @hybrid_property
+    def content(self):
+        # Decoded on access, so loads that never serialize the content never
+        # pay for decompression.
+        return content_codec.decode(self._content)
+
+    @content.setter
+    def content(self, value):
+        self._content = content_codec.encode(value)
+
+    @content.expression
+    def content(cls):
+        return cls._content
+
+
+class Note(NoteFields, Base):
+    __tablename__ = "notes"
+
+    __table_args__ = (
+        # Serves every per-user query: filter on user_id, newest first.
+        Index("ix_notes_user_created_id", "user_id", "created_at", "id"),
+    )
+
+
+class ArchivedNote(NoteFields, Base):
+    """Notes moved out of `notes` by app/services/note_archiver.py, ids kept."""
+
+    __tablename__ = "notes_archive"
+
+    __table_args__ = (
+        Index("ix_notes_archive_user_created_id", "user_id", "created_at", "id"),
+    )
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from app.db.database import Base
+
+
+class NoteCounter(Base):
+    """Maintained note counts, keyed "total", "day:YYYY-MM-DD" or "user:<id>"."""
+    __tablename__ = "note_counters"
+
+    key = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,20 +1,164 @@
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import bindparam, case, func, literal_column, union_all
 from sqlalchemy.future import select
-from app.models.note import Note
+from app.config.settings import settings
+from app.models.note import ArchivedNote, Note
+from app.repositories.note_stats_repository import NoteStatsRepository
+from app.utils import content_codec
+
+
+def note_columns(model) -> dict:
+    """Column expressions behind each `fields=` name, for `notes` or `notes_archive`.
+
+    Selecting columns instead of entities skips the ORM identity map. The
+    preview is cut by SQLite so the full content never leaves the database:
+    plain text to NOTES_PREVIEW_LENGTH characters, compressed content to the
+    leading bytes that hold them (`content_codec.prefix_bytes`), of which
+    only that many characters are decompressed.
+    """
+    return {
+        "title": model.title,
+        "content": model._content.label("content"),
+        "id": model.id,
+        "created_at": model.created_at,
+        "content_preview": case(
+            (
+                func.typeof(model._content) == "blob",
+                func.substr(model._content, 1, content_codec.prefix_bytes(settings.NOTES_PREVIEW_LENGTH)),
+            ),
+            else_=func.substr(model._content, 1, settings.NOTES_PREVIEW_LENGTH),
+        ).label("content_preview"),
+    }
+
+
+NOTE_COLUMNS = note_columns(Note)
+_ARCHIVE_COLUMNS = note_columns(ArchivedNote)
+
+# Ids per `IN (...)` query. The list is bound once per table, so this keeps a
+# query well below SQLite's bound-parameter limit.
+IN_CHUNK_SIZE = 400
+
+
+# Every read covers `notes` and `notes_archive` (see
+# app/services/note_archiver.py) in one UNION ALL statement. One statement
+# reads both tables from one SQLite snapshot, so an archive batch committing
+# meanwhile cannot make a note show up twice or go missing. Archived rows
+# load as `Note` instances; notes are never updated through these reads.
+#
+# The statements are built once with bind parameters; SQLAlchemy memoizes
+# each construct's cache key, so executing them skips construction and
+# cache-key generation.
+
+def _owned(model):
+    return model.user_id == bindparam("user_id")
+
+
+def _both(build):
+    return union_all(build(Note), build(ArchivedNote))
+
+
+def _newest_first(compound):
+    # Each side walks its (user_id, created_at, id) index; SQLite merges them.
+    columns = compound.selected_columns
+    return compound.order_by(columns.created_at.desc(), columns.id.desc())
+
+
+def _paged(compound):
+    return _newest_first(compound).offset(bindparam("skip")).limit(bindparam("limit"))
+
+
+def _entities(compound):
+    return select(Note).from_statement(compound)
+
+
+def _partial(model, fields: tuple[str, ...]):
+    # The sort keys are always selected; `_decoded` keeps only `fields`.
+    columns = NOTE_COLUMNS if model is Note else _ARCHIVE_COLUMNS
+    names = dict.fromkeys((*fields, "created_at", "id"))
+    return select(*(columns[name] for name in names)).where(_owned(model))
+
+
+_PAGE = _entities(_paged(_both(lambda m: select(m.__table__).where(_owned(m)))))
+_BY_ID = _entities(_both(lambda m: select(m.__table__).where(m.id == bindparam("note_id"), _owned(m))))
+_BY_IDS = _entities(
+    _both(lambda m: select(m.__table__).where(m.id.in_(bindparam("ids", expanding=True)), _owned(m)))
+)
+_VERSION = select(func.max(literal_column("version"))).select_from(
+    _both(lambda m: select(func.max(m.id).label("version")).where(_owned(m))).subquery()
+)
+
+
+@lru_cache(maxsize=64)
+def _partial_page(fields: tuple[str, ...]):
+    return _paged(_both(lambda m: _partial(m, fields)))
+
+
+@lru_cache(maxsize=64)
+def _partial_by_id(fields: tuple[str, ...]):
+    return _both(lambda m: _partial(m, fields).where(m.id == bindparam("note_id")))
+
+
+def _decoded(row, fields: tuple[str, ...]) -> dict:
+    """`fields` of a `note_columns` row as a dict, with stored content decoded."""
+    values = {field: row[field] for field in fields}
+    if "content" in values:
+        values["content"] = content_codec.decode(values["content"])
+    preview = values.get("content_preview")
+    if isinstance(preview, bytes):
+        values["content_preview"] = content_codec.decode_prefix(preview, settings.NOTES_PREVIEW_LENGTH)
+    return values
+
 
 class NoteRepository:
-    async def create(self, db, title: str, content: str):
+    async def create(self, db, title: str, content: str, user_id: int | None = None):
         """Create a Note record, commit and refresh so callers get persisted fields.
 
         Returns the SQLAlchemy Note instance with id and created_at populated.
+        The note counters are bumped in the same transaction.
         """
-        note = Note(title=title, content=content)
+        note = Note(title=title, content=content, user_id=user_id, created_at=datetime.utcnow())
         db.add(note)
+        await NoteStatsRepository.increment(db, NoteStatsRepository.keys_for(note))
         await db.commit()
         await db.refresh(note)
         return note
 
     @staticmethod
-    async def get_notes(db, skip: int, limit: int):
-        stmt = select(Note).offset(skip).limit(limit)
-        result = await db.execute(stmt)
-        return result.scalars().all()
+    async def get_notes(db, user_id: int, skip: int, limit: int):
+        """The user's notes, newest first, archived ones included."""
+        result = await db.execute(_PAGE, {"user_id": user_id, "skip": skip, "limit": limit})
+        return list(result.scalars())
+
+    @staticmethod
+    async def get_notes_partial(db, user_id: int, skip: int, limit: int, fields: tuple[str, ...]):
+        """Like `get_notes`, but loads only `fields`; returns one dict per note."""
+        result = await db.execute(_partial_page(fields), {"user_id": user_id, "skip": skip, "limit": limit})
+        return [_decoded(row, fields) for row in result.mappings()]
+
+    @staticmethod
+    async def get_notes_by_ids(db, user_id: int, ids: list[int]):
+        """The user's notes among `ids`, in no particular order."""
+        notes = []
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CHUNK_SIZE]
+            result = await db.execute(_BY_IDS, {"ids": chunk, "user_id": user_id})
+            notes.extend(result.scalars().all())
+        return notes
+
+    @staticmethod
+    async def get_note(db, user_id: int, note_id: int):
+        result = await db.execute(_BY_ID, {"note_id": note_id, "user_id": user_id})
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_version(db, user_id: int):
+        """Return the user's highest note id: notes are insert-only, so it changes on every write."""
+        return (await db.execute(_VERSION, {"user_id": user_id})).scalar() or 0
+
+    @staticmethod
+    async def get_note_partial(db, user_id: int, note_id: int, fields: tuple[str, ...]):
+        result = await db.execute(_partial_by_id(fields), {"note_id": note_id, "user_id": user_id})
+        row = result.mappings().first()
+        return None if row is None else _decoded(row, fields)
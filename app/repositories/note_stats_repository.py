@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, union_all
+from sqlalchemy.dialects.sqlite import insert
+
+from app.models.note import ArchivedNote, Note
+from app.models.note_counter import NoteCounter
+
+TOTAL = "total"
+
+
+def day_key(created_at: datetime) -> str:
+    return f"day:{created_at.date().isoformat()}"
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class NoteStatsRepository:
+    """Note counters kept in `note_counters`, read by primary key in O(1).
+
+    Writers call `increment` in the same transaction as the insert, so the
+    counters commit (or roll back) with the note. Archival moves notes
+    between tables and leaves the counters alone. `rebuild` recomputes them
+    from both tables to repair drift, e.g. after bulk loads that bypass the
+    repository.
+    """
+
+    @staticmethod
+    def keys_for(note: Note) -> list[str]:
+        keys = [TOTAL, day_key(note.created_at)]
+        if note.user_id is not None:
+            keys.append(user_key(note.user_id))
+        return keys
+
+    @staticmethod
+    async def increment(db, keys: list[str], delta: int = 1) -> None:
+        stmt = insert(NoteCounter).values([{"key": k, "count": delta} for k in keys])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NoteCounter.key],
+            set_={"count": NoteCounter.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def get(db, key: str) -> int:
+        result = await db.execute(select(NoteCounter.count).where(NoteCounter.key == key))
+        return result.scalar() or 0
+
+    @staticmethod
+    async def recent_days(db, days: int) -> dict[str, int]:
+        """Per-day counts for the latest `days` days that have notes, newest first."""
+        stmt = (
+            select(NoteCounter.key, NoteCounter.count)
+            .where(NoteCounter.key.like("day:%"))
+            .order_by(NoteCounter.key.desc())
+            .limit(days)
+        )
+        result = await db.execute(stmt)
+        return {key[len("day:"):]: count for key, count in result.all()}
+
+    @staticmethod
+    async def rebuild(db) -> int:
+        """Recompute every counter from `notes` and `notes_archive`; returns the total. Commits."""
+        await db.execute(delete(NoteCounter))
+        notes = union_all(
+            select(Note.created_at, Note.user_id),
+            select(ArchivedNote.created_at, ArchivedNote.user_id),
+        ).subquery()
+        total = (await db.execute(select(func.count()).select_from(notes))).scalar()
+        rows = [{"key": TOTAL, "count": total}]
+        day = func.date(notes.c.created_at)
+        by_day = await db.execute(select(day, func.count()).group_by(day))
+        rows += [{"key": f"day:{day}", "count": count} for day, count in by_day.all() if day]
+        by_user = await db.execute(
+            select(notes.c.user_id, func.count()).where(notes.c.user_id.is_not(None)).group_by(notes.c.user_id)
+        )
+        rows += [{"key": user_key(user_id), "count": count} for user_id, count in by_user.all()]
+        await db.execute(insert(NoteCounter), rows)
+        await db.commit()
+        return total
+
+    @staticmethod
+    async def initialize(db) -> None:
+        """Build the counters once for databases that predate them."""
+        exists = await db.execute(select(NoteCounter.key).where(NoteCounter.key == TOTAL))
+        if exists.scalar() is None:
+            await NoteStatsRepository.rebuild(db)
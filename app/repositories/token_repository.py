@@ -1,17 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, select
 
 from app.models.user import RevokedToken
 
+# Checked on every authenticated request: a prebuilt EXISTS, answered from
+# the unique index on token without loading a row.
+_IS_REVOKED = select(exists().where(RevokedToken.token == bindparam("token")))
+
 
 class TokenRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def is_revoked(self, token: str) -> bool:
-        q = select(RevokedToken).where(RevokedToken.token == token)
-        res = await self.db.execute(q)
-        return res.scalars().first() is not None
+        res = await self.db.execute(_IS_REVOKED, {"token": token})
+        return bool(res.scalar())
 
     async def add_revoked(self, token: str) -> RevokedToken:
         r = RevokedToken(token=token)
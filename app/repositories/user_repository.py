@@ -1,26 +1,84 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, case, exists, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
 
 from app.models.user import User
 
+# Statements are built once: SQLAlchemy memoizes each construct's cache key,
+# so executing a prebuilt statement skips both construction and cache-key
+# generation. Values are passed as bind parameters.
+_BY_USERNAME = select(User).where(User.username == bindparam("username")).limit(1)
+_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
+_EMAIL_EXISTS = select(exists().where(User.email == bindparam("email")))
+
+# A subject matches a username first, then an email, in one query.
+_MATCHES_IDENTIFIER = or_(User.username == bindparam("identifier"), User.email == bindparam("identifier"))
+_USERNAME_FIRST = case((User.username == bindparam("identifier"), 0), else_=1)
+_ID_BY_IDENTIFIER = select(User.id).where(_MATCHES_IDENTIFIER).limit(1)
+_CREDENTIALS_BY_IDENTIFIER = (
+    select(User.id, User.hashed_password).where(_MATCHES_IDENTIFIER).order_by(_USERNAME_FIRST).limit(1)
+)
+_PROFILE_BY_IDENTIFIER = (
+    select(User.id, User.email, User.name).where(_MATCHES_IDENTIFIER).order_by(_USERNAME_FIRST).limit(1)
+)
+
+# Compare-and-swap: a password changed since the old hash was read is kept.
+_REPLACE_HASH = (
+    update(User)
+    .where(User.id == bindparam("user_id"), User.hashed_password == bindparam("old_hash"))
+    .values(hashed_password=bindparam("new_hash"))
+)
+
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_by_username(self, username: str) -> User | None:
-        q = select(User).where(User.username == username)
-        res = await self.db.execute(q)
+        res = await self.db.execute(_BY_USERNAME, {"username": username})
         return res.scalars().first()
 
     async def get_by_email(self, email: str) -> User | None:
-        q = select(User).where(User.email == email)
-        res = await self.db.execute(q)
+        res = await self.db.execute(_BY_EMAIL, {"email": email})
         return res.scalars().first()
 
+    async def email_exists(self, email: str) -> bool:
+        res = await self.db.execute(_EMAIL_EXISTS, {"email": email})
+        return bool(res.scalar())
+
+    async def get_id_by_identifier(self, identifier: str) -> int | None:
+        """Resolve a token subject (username or email) to a user id in one query."""
+        res = await self.db.execute(_ID_BY_IDENTIFIER, {"identifier": identifier})
+        return res.scalar()
+
+    async def get_credentials(self, identifier: str):
+        """(id, hashed_password) of the user named by `identifier`, or None."""
+        res = await self.db.execute(_CREDENTIALS_BY_IDENTIFIER, {"identifier": identifier})
+        return res.first()
+
+    async def get_profile(self, identifier: str):
+        """(id, email, name) of the user named by `identifier`, or None."""
+        res = await self.db.execute(_PROFILE_BY_IDENTIFIER, {"identifier": identifier})
+        return res.first()
+
+    async def replace_password_hash(self, user_id: int, old_hash: str, new_hash: str) -> bool:
+        """Swap `old_hash` for `new_hash`; False if the stored hash changed meanwhile. The caller commits."""
+        res = await self.db.execute(_REPLACE_HASH, {"user_id": user_id, "old_hash": old_hash, "new_hash": new_hash})
+        return res.rowcount == 1
+
     async def create_user(self, username: str, email: str, name: str | None, hashed_password: str) -> User:
         user = User(username=username, email=email, name=name, hashed_password=hashed_password)
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
         return user
+
+    async def insert_many(self, rows: list[dict]) -> list[str]:
+        """Insert `rows`, skipping any that hit a unique constraint.
+
+        Returns the emails actually inserted; the caller commits. Conflicts
+        are left to the constraints rather than checked up front.
+        """
+        stmt = insert(User).values(rows).on_conflict_do_nothing().returning(User.email)
+        res = await self.db.execute(stmt)
+        return list(res.scalars())
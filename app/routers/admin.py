@@ -0,0 +1,50 @@
+from concurrent.futures.process import BrokenProcessPool
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.services.audit_trail import audit_trail
+from app.services.auth_service import require_admin
+from app.services.user_import import CONTENT_TYPES, import_pool, import_users, iter_body_lines
+from app.utils.response import success_response
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.post("/users/import")
+async def import_users_endpoint(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    admin: str = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Provision users from a CSV or NDJSON request body.
+
+    The format comes from `format`, else from the Content-Type (`text/csv`,
+    `application/x-ndjson`). The body is streamed; see
+    app/services/user_import.py for the record layout and conflict handling.
+    """
+    fmt = format or CONTENT_TYPES.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=",
+        )
+    pool = import_pool.get()
+    try:
+        report = await import_users(db, iter_body_lines(request.stream()), fmt, pool)
+    except BrokenProcessPool:
+        # A hashing worker died. Chunks already committed stay; re-running
+        # the import reports them as conflicts, on a fresh pool.
+        import_pool.discard(pool)
+        raise
+    audit_trail.record(
+        "user_import",
+        subject=admin,
+        client_ip=request.client.host if request.client else None,
+        detail=f"inserted={report.inserted} conflicts={report.conflicts} invalid={report.invalid}",
+        request_id=getattr(request.state, "request_id", None),
+    )
+    return success_response(data=report.as_dict(), request=request)
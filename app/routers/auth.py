@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from pydantic import BaseModel, StrictStr, Field
-from pydantic import field_validator
+from pydantic import BaseModel
+from app.services import jwt_keys
 from app.services.auth_service import create_access_token, get_current_user
+from app.schemas.user import RegisterRequest
 from app.services.user_service import UserService
 from app.utils.response import success_response
 from app.config.settings import settings
@@ -9,6 +10,8 @@ from app.db.database import get_db
 from app.utils.rate_limiter import RateLimiter
 from fastapi import Response
 from app.repositories.token_repository import TokenRepository
+from app.services.audit_trail import audit_trail
+from app.utils.http_cache import etag_matches, not_modified, set_cache_headers, weak_etag
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
@@ -17,34 +20,28 @@ router = APIRouter()
 # Simple in-memory limiter (demo only). Limits to 5 attempts per 60 seconds.
 limiter = RateLimiter(limit=5, window_seconds=60)
 
+PROFILE_CACHE_CONTROL = "private, no-cache"
 
-class TokenRequest(BaseModel):
-    username: str
-    password: str
+
+def _client_ip(request: Request) -> str:
+    # Prefer X-Forwarded-For so tests can override the key; fallback to
+    # request.client.host.
+    return request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown")
 
 
-class RegisterRequest(BaseModel):
-    # using plain str for email to avoid external dependency on email-validator
-    email: str
-    password: StrictStr = Field(..., min_length=8)
-    name: StrictStr = Field(..., min_length=2, max_length=100)
+def _audit(request: Request, event: str, subject: str | None, detail: str | None = None) -> None:
+    audit_trail.record(
+        event,
+        subject=subject,
+        client_ip=_client_ip(request),
+        detail=detail,
+        request_id=getattr(request.state, "request_id", None),
+    )
 
-    @field_validator("password")
-    @classmethod
-    def validate_password_strength(cls, v: str) -> str:
-        if not any(c.isupper() for c in v):
-            raise ValueError("Password must contain uppercase letter")
-        if not any(c.isdigit() for c in v):
-            raise ValueError("Password must contain number")
-        return v
 
-    @field_validator("email")
-    @classmethod
-    def validate_email(cls, v: str) -> str:
-        # very small heuristic check to avoid extra dependency
-        if "@" not in v or "." not in v:
-            raise ValueError("Invalid email address")
-        return v
+class TokenRequest(BaseModel):
+    username: str
+    password: str
 
 
 @router.post("/auth/token")
@@ -54,18 +51,21 @@ async def token(req: TokenRequest, request: Request, db=Depends(get_db)):
     Expects `username` and `password` in the body. Verifies credentials
     against stored users.
     """
-    # Rate limit by client IP (best-effort). Prefer X-Forwarded-For header
-    # so tests can override the key; fallback to request.client.host.
-    client_ip = request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown")
+    # Rate limit by client IP (best-effort).
+    client_ip = _client_ip(request)
 
     if not limiter.allow(client_ip):
+        _audit(request, "login_failure", req.username, "rate_limited")
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many requests")
 
     service = UserService(db)
     auth_ok = await service.authenticate(req.username, req.password)
     if not auth_ok:
+        _audit(request, "login_failure", req.username, "invalid_credentials")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    _audit(request, "login_success", req.username)
+
     access_token = create_access_token(req.username)
     # on successful auth reset limiter for this IP
     limiter.reset(client_ip)
@@ -86,6 +86,7 @@ async def logout(request: Request, user: str = Depends(get_current_user), db: As
 
     repo = TokenRepository(db)
     await repo.add_revoked(token)
+    _audit(request, "logout", user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -97,13 +98,13 @@ async def register(reg: RegisterRequest, request: Request, db=Depends(get_db)):
     """
     service = UserService(db)
     # check duplicate email
-    existing = await service.repo.get_by_email(reg.email)
-    if existing:
+    if await service.repo.email_exists(reg.email):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
     # Use email as username internally to preserve compatibility
     username = reg.email
     user = await service.register_user(username=username, email=reg.email, name=reg.name, password=reg.password)
+    _audit(request, "register", user.username)
 
     # create token and return it with user info (no password)
     access_token = create_access_token(user.username)
@@ -112,15 +113,36 @@ async def register(reg: RegisterRequest, request: Request, db=Depends(get_db)):
 
 
 @router.get("/auth/profile")
-async def profile(request: Request, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def profile(request: Request, response: Response, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """Return the current user's profile (id, email, name)."""
     service = UserService(db)
     # subject is username/email
-    u = await service.repo.get_by_username(user)
-    if not u:
-        u = await service.repo.get_by_email(user)
-    if not u:
+    u = await service.repo.get_profile(user)
+    if u is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    etag = weak_etag("profile", u.id, u.email, u.name)
+    if etag_matches(request, etag):
+        return not_modified(etag, PROFILE_CACHE_CONTROL)
+
     data = {"id": u.id, "email": u.email, "name": u.name}
+    set_cache_headers(response, etag, PROFILE_CACHE_CONTROL)
     return success_response(data=data, request=request)
+
+
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks(request: Request):
+    """Public signing keys (RFC 7517) for verifying tokens without calling this API.
+
+    The body is serialized once per key configuration; see
+    app/services/jwt_keys.py for rotation.
+    """
+    keyset = jwt_keys.current()
+    cache_control = f"public, max-age={settings.JWKS_CACHE_SECONDS}"
+    if etag_matches(request, keyset.etag):
+        return not_modified(keyset.etag, cache_control)
+    return Response(
+        content=keyset.jwks,
+        media_type="application/jwk-set+json",
+        headers={"ETag": keyset.etag, "Cache-Control": cache_control},
+    )
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 from app.services.health_service import HealthService
 from app.utils.response import success_response
 
@@ -21,4 +22,7 @@ async def live(request: Request):
 @router.get("/ready")
 async def ready(request: Request):
     result = await service.ready()
-    return success_response(data=result, request=request)
+    body = success_response(data=result, request=request)
+    if result["status"] != "ready":
+        return JSONResponse(status_code=503, content=body)
+    return body
@@ -0,0 +1,40 @@
+import tracemalloc
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Request
+
+from app.services.auth_service import require_admin
+from app.services.db_probe import db_probe
+from app.services.diagnostics import diagnostics, tracemalloc_top
+from app.utils import metrics
+from app.utils.response import success_response
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/diagnostics")
+async def runtime_diagnostics(
+    request: Request,
+    tracemalloc_action: Optional[Literal["start", "stop"]] = None,
+    top: int = 10,
+    admin: str = Depends(require_admin),
+):
+    """Loop lag, DB pool, GC and memory stats.
+
+    `tracemalloc_action=start` begins tracing allocations (this has a cost);
+    while tracing, the response lists the `top` allocation sites.
+    """
+    if tracemalloc_action == "start" and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif tracemalloc_action == "stop" and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    data = diagnostics.stats()
+    data["db_probe"] = db_probe.snapshot()
+    data["memory"]["top_allocations"] = tracemalloc_top(top)
+    return success_response(data=data, request=request)
+
+
+@router.get("/metrics")
+async def metrics_snapshot(request: Request, admin: str = Depends(require_admin)):
+    return success_response(data=metrics.snapshot(), request=request)
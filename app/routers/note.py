@@ -1,14 +1,43 @@
-from fastapi import APIRouter, Depends
-from app.schemas.note import NoteCreate, NoteResponse
-from app.schemas.response import APIResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.config.settings import settings
+from app.schemas.note import NOTE_FIELDS, NoteBatch, NoteBatchRequest, NoteCreate, NotePartial, NoteResponse, NoteStats
+from app.schemas.response import APIResponse, PaginatedResponse
 from app.services.note_service import NoteService
 from app.db.database import get_db
+from app.services.auth_service import get_current_user_id
+from app.utils.http_cache import etag_matches, not_modified, set_cache_headers, weak_etag
 
 router = APIRouter(prefix="/notes", tags=["Notes"])
 
+# Clients may keep a copy but must revalidate it (cheaply, via ETag) each time.
+NOTES_CACHE_CONTROL = "private, no-cache"
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Validate a `fields=title,id` parameter; returns the names in canonical order."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested.difference(NOTE_FIELDS)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(NOTE_FIELDS)}",
+        )
+    return tuple(f for f in NOTE_FIELDS if f in requested)
+
+
+def parse_ids(ids: str) -> list[int]:
+    """Parse `ids=1,2,3`."""
+    try:
+        return [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="ids must be comma-separated integers")
+
+
 @router.post("/", response_model=APIResponse[NoteResponse])
-async def create_note(note: NoteCreate, db=Depends(get_db)):
-    created = await NoteService.create_note(db, note)
+async def create_note(note: NoteCreate, user_id: int = Depends(get_current_user_id), db=Depends(get_db)):
+    created = await NoteService.create_note(db, note, user_id)
     return {
         "success": True,
         "data": created,
@@ -16,23 +45,95 @@ async def create_note(note: NoteCreate, db=Depends(get_db)):
     }
 
 
-@router.get("/", response_model=APIResponse[list[NoteResponse]])
-async def list_notes(skip: int = 0, limit: int = 10, db=Depends(get_db)):
-    notes = await NoteService.list_notes(db, skip, limit)
+@router.get("/", response_model=PaginatedResponse[list[NotePartial]], response_model_exclude_unset=True)
+async def list_notes(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    fields: str | None = None,
+    user_id: int = Depends(get_current_user_id),
+    db=Depends(get_db),
+):
+    """The caller's notes, newest first, with `total` from the maintained counters.
+
+    `fields` (e.g. `id,title,content_preview`) loads and returns only those
+    fields; without it every field except `content_preview` is returned.
+    """
+    selected = parse_fields(fields)
+    # The ETag comes from the user's notes version, so a match skips the list query.
+    version = await NoteService.notes_version(db, user_id)
+    etag = weak_etag("notes", user_id, version, skip, limit, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag, NOTES_CACHE_CONTROL)
+
+    notes = await NoteService.list_notes(db, user_id, skip, limit, selected)
+    total = await NoteService.count_notes(db, user_id)
+    set_cache_headers(response, etag, NOTES_CACHE_CONTROL)
     return {
         "success": True,
         "data": notes,
+        "request_id": "auto",
+        "total": total
+    }
+
+
+async def _batch(db, user_id: int, ids: list[int]):
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No ids given")
+    if len(ids) > settings.NOTES_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.NOTES_BATCH_MAX_IDS} ids per request",
+        )
+    notes, missing = await NoteService.get_notes_by_ids(db, user_id, ids)
+    return {
+        "success": True,
+        "data": {"notes": notes, "missing": missing},
         "request_id": "auto"
     }
 
 
-# @router.get("/{note_id}")
-# async def get_note(
-#     note_id: int,
-#     request: Request,
-#     db: AsyncSession = Depends(get_db),
-# ):
-#     note = await service.get_note(db, note_id)
-#     if not note:
-#         raise HTTPException(status_code=404, detail="Note not found")
-#     return success_response(data=note, request=request)
+# Declared before /{note_id} so "stats" and "batch" are not taken for note ids.
+@router.get("/stats", response_model=APIResponse[NoteStats])
+async def notes_stats(
+    days: int = Query(30, ge=1, le=366),
+    user_id: int = Depends(get_current_user_id),
+    db=Depends(get_db),
+):
+    """Note counts from the maintained counters: all notes, the caller's, and per day."""
+    return {
+        "success": True,
+        "data": await NoteService.stats(db, user_id, days),
+        "request_id": "auto"
+    }
+
+
+@router.get("/batch", response_model=APIResponse[NoteBatch])
+async def get_notes_batch(ids: str, user_id: int = Depends(get_current_user_id), db=Depends(get_db)):
+    """Fetch several notes by id (`?ids=3,1,2`), returned in the requested order."""
+    return await _batch(db, user_id, parse_ids(ids))
+
+
+@router.post("/batch", response_model=APIResponse[NoteBatch])
+async def post_notes_batch(body: NoteBatchRequest, user_id: int = Depends(get_current_user_id), db=Depends(get_db)):
+    """Same as GET /notes/batch, for id sets too large for a URL."""
+    return await _batch(db, user_id, body.ids)
+
+
+@router.get("/{note_id}", response_model=APIResponse[NotePartial], response_model_exclude_unset=True)
+async def get_note(
+    note_id: int,
+    fields: str | None = None,
+    user_id: int = Depends(get_current_user_id),
+    db=Depends(get_db),
+):
+    note = await NoteService.get_note(db, user_id, note_id, parse_fields(fields))
+    if not note:
+        # Other users' notes are indistinguishable from missing ones.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
+    return {
+        "success": True,
+        "data": note,
+        "request_id": "auto"
+    }
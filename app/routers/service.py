@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from app.services.service_info import ServiceInfoService
 from app.utils.response import success_response
+from app.utils.http_cache import etag_matches, not_modified, set_cache_headers
 
 router = APIRouter(prefix="/service", tags=["Service"])
 service = ServiceInfoService()
 
+INFO_CACHE_CONTROL = "public, max-age=300"
+
 
 @router.get("/info")
-async def service_info(request: Request):
+async def service_info(request: Request, response: Response):
+    etag = service.etag()
+    if etag_matches(request, etag):
+        return not_modified(etag, INFO_CACHE_CONTROL)
+
     result = await service.get_info()
+    set_cache_headers(response, etag, INFO_CACHE_CONTROL)
     return success_response(data=result, request=request)
 
 
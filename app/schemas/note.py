@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 class NoteBase(BaseModel):
@@ -13,3 +15,36 @@ class NoteResponse(NoteBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NoteBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+
+
+class NoteBatch(BaseModel):
+    """Notes in the order their ids were requested, plus the ids not found."""
+    notes: list[NoteResponse]
+    missing: list[int]
+
+
+class NoteStats(BaseModel):
+    total: int
+    mine: int
+    per_day: dict[str, int]
+
+
+# Fields a client may request with `fields=`; `content_preview` is the start
+# of `content`, cut in SQL.
+NOTE_FIELDS = ("title", "content", "id", "created_at", "content_preview")
+
+
+class NotePartial(BaseModel):
+    """A note restricted to the requested fields; endpoints serialize it with
+    `response_model_exclude_unset`, so fields not loaded are omitted."""
+    title: Optional[str] = None
+    content: Optional[str] = None
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    content_preview: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -7,3 +7,8 @@ class APIResponse(BaseModel, Generic[T]):
     success: bool
     data: Optional[T] = None
     request_id: str
+
+
+class PaginatedResponse(APIResponse[T], Generic[T]):
+    """List envelope that also carries the total number of items."""
+    total: int
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field, StrictStr, field_validator
+
+
+class RegisterRequest(BaseModel):
+    # using plain str for email to avoid external dependency on email-validator
+    email: str
+    password: StrictStr = Field(..., min_length=8)
+    name: StrictStr = Field(..., min_length=2, max_length=100)
+
+    @field_validator("password")
+    @classmethod
+    def validate_password_strength(cls, v: str) -> str:
+        if not any(c.isupper() for c in v):
+            raise ValueError("Password must contain uppercase letter")
+        if not any(c.isdigit() for c in v):
+            raise ValueError("Password must contain number")
+        return v
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, v: str) -> str:
+        # very small heuristic check to avoid extra dependency
+        if "@" not in v or "." not in v:
+            raise ValueError("Invalid email address")
+        return v
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import insert
+
+from app.config.settings import settings
+from app.db.database import AsyncSessionLocal
+from app.models.auth_event import AuthEvent
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AuditTrail:
+    """Buffer auth events in memory and write them to `auth_events` in batches.
+
+    `record()` never waits: it stamps the event and puts it on a bounded
+    queue, counting it as overflow when the queue is full. A background task
+    bulk-inserts a batch when `batch_size` events are waiting or
+    `flush_interval` seconds after the first one arrived; `stop()` writes
+    whatever is left.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_queue: int = settings.AUDIT_QUEUE_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        enabled: bool = settings.AUDIT_ENABLED,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.recorded = 0
+        self.overflow = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self._batch: List[dict] = []
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        event: str,
+        subject: Optional[str] = None,
+        client_ip: Optional[str] = None,
+        detail: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> bool:
+        if not self.enabled:
+            return False
+        row = {
+            "event": event,
+            "subject": subject,
+            "client_ip": client_ip,
+            "detail": detail,
+            "request_id": request_id,
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.overflow += 1
+            return False
+        self.recorded += 1
+        if self.queue.qsize() + len(self._batch) >= self.batch_size:
+            self._full.set()
+        return True
+
+    def _take(self) -> None:
+        while len(self._batch) < self.batch_size and not self.queue.empty():
+            self._batch.append(self.queue.get_nowait())
+
+    async def _write(self) -> None:
+        batch, self._batch = self._batch, []
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert(AuthEvent), batch)
+                await session.commit()
+        except Exception as exc:
+            self.failed += len(batch)
+            logger.error("Dropped %d audit events: %s", len(batch), exc)
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self.queue.get())
+            if self.queue.qsize() + 1 < self.batch_size:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._take()
+            # Shielded so stop() only ever cancels the waiting above; a
+            # batch already handed to the database is left to finish.
+            self._writing = asyncio.create_task(self._write())
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+    async def flush(self) -> None:
+        """Write everything buffered so far (also used at shutdown)."""
+        self._take()
+        while self._batch:
+            await self._write()
+            self._take()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writing is not None:
+            await self._writing
+            self._writing = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self.queue.qsize() + len(self._batch),
+            "recorded": self.recorded,
+            "written": self.written,
+            "batches": self.batches,
+            "overflow": self.overflow,
+            "failed": self.failed,
+        }
+
+
+audit_trail = AuditTrail()
+metrics.register("audit_trail", audit_trail.stats)
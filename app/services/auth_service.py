@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
 from app.repositories.token_repository import TokenRepository
+from app.repositories.user_repository import UserRepository
+from app.services import jwt_keys
 
 from app.config.settings import settings
 
@@ -51,7 +53,11 @@ def create_access_token(subject: str, expires_delta: timedelta | None = None) ->
 
     # Determine active key and include kid in header for rotation
     kid = getattr(settings, "ACTIVE_KEY_ID", None)
-    key = settings.JWT_KEYS.get(kid) if kid else None
+    if jwt_keys.is_asymmetric(settings.JWT_ALGORITHM):
+        # Private keys are parsed once per configuration, not per token.
+        kid, key = jwt_keys.current().signing_key(kid)
+    else:
+        key = settings.JWT_KEYS.get(kid) if kid else None
     if not key:
         # Fallback to first value in JWT_KEYS
         key = next(iter(settings.JWT_KEYS.values()))
@@ -63,8 +69,11 @@ def create_access_token(subject: str, expires_delta: timedelta | None = None) ->
     return token
 
 
-def _select_key_for_token(token: str) -> str:
-    """Extract kid from token header without verifying signature and return the configured secret."""
+def _select_key_for_token(token: str):
+    """Extract kid from token header without verifying signature and return the configured key.
+
+    That is the HMAC secret, or with EdDSA / RS256 the public key.
+    """
     kid = None
     if _get_unverified_header is not None:
         try:
@@ -73,6 +82,12 @@ def _select_key_for_token(token: str) -> str:
         except Exception:
             kid = None
 
+    if jwt_keys.is_asymmetric(settings.JWT_ALGORITHM):
+        verifying = jwt_keys.current().verifying
+        if kid in verifying:
+            return verifying[kid]
+        return verifying.get(getattr(settings, "ACTIVE_KEY_ID", None))
+
     if kid and kid in settings.JWT_KEYS:
         return settings.JWT_KEYS[kid]
 
@@ -133,3 +148,21 @@ async def get_current_user(
         request.state.user = subject
         request.state.token = token
     return subject
+
+
+async def get_current_user_id(
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> int:
+    """Dependency resolving the authenticated subject to its `users.id`."""
+    user_id = await UserRepository(db).get_id_by_identifier(user)
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown user")
+    return user_id
+
+
+def require_admin(user: str = Depends(get_current_user)) -> str:
+    """Dependency admitting only subjects listed in ADMIN_SUBJECTS."""
+    if user not in settings.ADMIN_SUBJECTS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
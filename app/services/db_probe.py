@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import settings
+from app.db.database import engine
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """Snapshot of the engine's connection pool (QueuePool-style pools only)."""
+    pool = engine.pool
+    stats = {"checked_out": pool.checkedout()} if hasattr(pool, "checkedout") else {}
+    if hasattr(pool, "size"):
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        stats.update(size=pool.size(), overflow=pool.overflow(), capacity=capacity)
+        if capacity:
+            stats["saturation"] = round(stats["checked_out"] / capacity, 3)
+    return stats
+
+
+class DatabaseProbe:
+    """Ping the database in the background and cache the result.
+
+    Each check checks out a connection and runs ``SELECT 1`` under a
+    deadline, recording the checkout wait and the query latency separately,
+    plus pool occupancy. `status()` only reads the cached state, so
+    readiness probes cost O(1) and never add DB load.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float = settings.DB_PROBE_INTERVAL_SECONDS,
+        timeout: float = settings.DB_PROBE_TIMEOUT_SECONDS,
+        max_latency_ms: float = settings.DB_PROBE_MAX_LATENCY_MS,
+        max_checkout_ms: float = settings.DB_PROBE_MAX_CHECKOUT_MS,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.max_latency_ms = max_latency_ms
+        self.max_checkout_ms = max_checkout_ms
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.checkout_ms: Optional[float] = None
+        self.pool: dict = {}
+        self.checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def check(self) -> None:
+        start = time.perf_counter()
+        checked_out = start
+
+        async def ping():
+            nonlocal checked_out
+            async with self.engine.connect() as conn:
+                checked_out = time.perf_counter()
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(ping(), self.timeout)
+        except asyncio.TimeoutError:
+            self.ok, self.error = False, "timeout"
+        except Exception as exc:
+            self.ok, self.error = False, type(exc).__name__
+        else:
+            self.ok, self.error = True, None
+        done = time.perf_counter()
+        if checked_out == start:
+            # Never got a connection: the whole wait was checkout.
+            self.checkout_ms, self.latency_ms = (done - start) * 1000, None
+        else:
+            self.checkout_ms = (checked_out - start) * 1000
+            self.latency_ms = (done - checked_out) * 1000
+        self.pool = pool_stats(self.engine)
+        self.checked_at = time.monotonic()
+        if not self.ok:
+            logger.warning("Database probe failed: %s", self.error)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:  # pragma: no cover - check() handles its own errors
+                logger.exception("Database probe crashed")
+
+    async def start(self) -> None:
+        """Run a first check so readiness is known before traffic arrives."""
+        await self.check()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def unready_reason(self) -> Optional[str]:
+        if self.checked_at is None:
+            return "db_check_pending"
+        if not self.ok:
+            return "db_unreachable"
+        if self.checkout_ms is not None and self.checkout_ms > self.max_checkout_ms:
+            return "db_pool_wait"
+        if self.latency_ms is not None and self.latency_ms > self.max_latency_ms:
+            return "db_slow"
+        if time.monotonic() - self.checked_at > 3 * self.interval + self.timeout:
+            return "db_check_stale"
+        return None
+
+    def status(self) -> dict:
+        if not self.running:
+            # Probing disabled (or not started, e.g. in tests): keep the
+            # previous always-ready behaviour.
+            return {"status": "ready"}
+        reason = self.unready_reason()
+        if reason:
+            return {"status": "unready", "reason": reason}
+        return {"status": "ready"}
+
+    def snapshot(self) -> dict:
+        return {
+            "ok": self.ok,
+            "error": self.error,
+            "latency_ms": self.latency_ms,
+            "checkout_ms": self.checkout_ms,
+            "pool": self.pool,
+            "age_seconds": None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3),
+        }
+
+
+db_probe = DatabaseProbe(engine)
+metrics.register("db_probe", db_probe.snapshot)
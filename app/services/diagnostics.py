@@ -0,0 +1,227 @@
+import asyncio
+import gc
+import os
+import resource
+import time
+import tracemalloc
+from collections import deque
+from typing import Deque, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.settings import settings
+from app.db.database import engine
+from app.utils import metrics
+
+
+def _percentile(samples, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class LoopLagSampler:
+    """Measure how late the event loop wakes a task that sleeps `interval`.
+
+    Anything that blocks the loop (bcrypt, sync I/O, heavy validation)
+    shows up as lag: the extra time beyond the requested sleep.
+    """
+
+    def __init__(self, interval: float = 0.25, window: int = 600):
+        self.interval = interval
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record((loop.time() - start - self.interval) * 1000)
+
+    def record(self, lag_ms: float) -> None:
+        lag_ms = max(0.0, lag_ms)
+        self.samples.append(lag_ms)
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        samples = list(self.samples)
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": len(samples),
+            "last_ms": samples[-1] if samples else None,
+            "p50_ms": _percentile(samples, 0.50),
+            "p99_ms": _percentile(samples, 0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+class PoolMonitor:
+    """Count pool checkouts/checkins and how long connections are held.
+
+    Pool events fire after a checkout succeeds, so the wait for a free
+    connection is not visible here; the DB probe samples it instead.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.hold_total_ms = 0.0
+        self.hold_max_ms = 0.0
+        self._engines = []
+
+    def install(self, engine: AsyncEngine) -> None:
+        # Listening on the engine (not its pool) survives engine.dispose().
+        target = engine.sync_engine
+        if target in self._engines:
+            return
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        self._engines.append(target)
+
+    def _on_connect(self, dbapi_conn, record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_conn, record, proxy) -> None:
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+        record.info["checkout_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_conn, record) -> None:
+        started = record.info.pop("checkout_at", None)
+        if started is None:
+            return
+        self.checkins += 1
+        self.checked_out -= 1
+        held = (time.perf_counter() - started) * 1000
+        self.hold_total_ms += held
+        self.hold_max_ms = max(self.hold_max_ms, held)
+
+    def stats(self) -> dict:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "hold_avg_ms": self.hold_total_ms / self.checkins if self.checkins else None,
+            "hold_max_ms": self.hold_max_ms,
+        }
+
+
+class GcMonitor:
+    """Time garbage collections per generation through `gc.callbacks`."""
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_total_ms = [0.0, 0.0, 0.0]
+        self.pause_max_ms = [0.0, 0.0, 0.0]
+        self.collected = 0
+        self._started: Optional[float] = None
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._started = time.perf_counter()
+            return
+        if self._started is None:
+            return
+        gen = info.get("generation", 0)
+        pause = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        self.collections[gen] += 1
+        self.pause_total_ms[gen] += pause
+        self.pause_max_ms[gen] = max(self.pause_max_ms[gen], pause)
+        self.collected += info.get("collected", 0)
+
+    def install(self) -> None:
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self) -> None:
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def stats(self) -> dict:
+        return {
+            "collections": self.collections,
+            "pause_total_ms": [round(v, 3) for v in self.pause_total_ms],
+            "pause_max_ms": [round(v, 3) for v in self.pause_max_ms],
+            "collected": self.collected,
+            "thresholds": gc.get_threshold(),
+        }
+
+
+def memory_stats() -> dict:
+    stats = {"max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    try:
+        with open("/proc/self/statm") as f:
+            stats["rss_kb"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:  # pragma: no cover - non-Linux
+        pass
+    stats["tracemalloc"] = tracemalloc.is_tracing()
+    return stats
+
+
+def tracemalloc_top(limit: int = 10) -> list:
+    """Top allocation sites by size; empty unless tracemalloc is tracing."""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    return [
+        {"site": str(stat.traceback[0]), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class Diagnostics:
+    """Runtime diagnostics: loop lag, pool usage, GC pauses and memory."""
+
+    def __init__(self, engine: AsyncEngine, lag_interval: float = settings.DIAGNOSTICS_LOOP_LAG_INTERVAL_SECONDS):
+        self.engine = engine
+        self.loop_lag = LoopLagSampler(interval=lag_interval)
+        self.pool = PoolMonitor()
+        self.gc = GcMonitor()
+
+    def start(self) -> None:
+        self.pool.install(self.engine)
+        self.gc.install()
+        self.loop_lag.start()
+
+    async def stop(self) -> None:
+        await self.loop_lag.stop()
+        self.gc.uninstall()
+
+    def stats(self) -> dict:
+        """Cheap counters only; exported on the metrics surface."""
+        return {
+            "loop_lag": self.loop_lag.stats(),
+            "pool": self.pool.stats(),
+            "gc": self.gc.stats(),
+            "memory": memory_stats(),
+        }
+
+
+diagnostics = Diagnostics(engine)
+metrics.register("diagnostics", diagnostics.stats)
@@ -1,8 +1,13 @@
 from datetime import datetime, timezone
 
+from app.services.db_probe import DatabaseProbe, db_probe
+
 
 class HealthService:
 
+    def __init__(self, probe: DatabaseProbe = db_probe):
+        self.probe = probe
+
     async def ping(self):
         return {"status": "ok"}
 
@@ -13,5 +18,5 @@ class HealthService:
         }
 
     async def ready(self):
-        # Later we will add DB check
-        return {"status": "ready"}
+        # Reads the background DB probe's cached state; never queries the DB.
+        return self.probe.status()
@@ -0,0 +1,98 @@
+"""Asymmetric JWT keys (EdDSA / RS256) and the JWKS document.
+
+With JWT_ALGORITHM set to "EdDSA" or "RS256", tokens are signed with the
+private key JWT_PRIVATE_KEYS[ACTIVE_KEY_ID] and carry its `kid`. The public
+half of every private key, plus any verification-only key in
+JWT_PUBLIC_KEYS, is published on /.well-known/jwks.json so other services
+can verify tokens locally. Keys are given as PEM text or as a path to a PEM
+file.
+
+Rotating without breaking verifiers that cache the JWKS:
+
+    1. add the new private key under a new kid (ACTIVE_KEY_ID unchanged)
+    2. wait JWKS_CACHE_SECONDS, so every verifier has fetched it
+    3. point ACTIVE_KEY_ID at the new kid
+    4. once the old key's tokens have expired, remove it (or move its
+       public half to JWT_PUBLIC_KEYS while tokens may still be around)
+
+Keys are parsed and the JWKS is serialized once per configuration, never
+per request. Asymmetric signing needs the `cryptography` package; the
+default HS256 (JWT_KEYS secrets) does not, and publishes an empty JWKS.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from app.config.settings import settings
+
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "RS256")
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    return algorithm in ASYMMETRIC_ALGORITHMS
+
+
+@dataclass(frozen=True)
+class KeySet:
+    signing: Dict[str, Any]
+    verifying: Dict[str, Any]
+    jwks: bytes
+    etag: str
+
+    def signing_key(self, kid: str | None) -> Tuple[str, Any]:
+        """(kid, private key) for `kid`, else the first configured key."""
+        if kid in self.signing:
+            return kid, self.signing[kid]
+        if not self.signing:
+            raise RuntimeError(f"JWT_ALGORITHM={settings.JWT_ALGORITHM} needs a key in JWT_PRIVATE_KEYS")
+        return next(iter(self.signing.items()))
+
+
+def _pem(value: str) -> bytes:
+    if value.lstrip().startswith("-----BEGIN"):
+        return value.encode("utf-8")
+    with open(value, "rb") as f:
+        return f.read()
+
+
+def _crypto(algorithm: str):
+    """(serialization module, PyJWT JWK class) for `algorithm`."""
+    try:
+        from cryptography.hazmat.primitives import serialization
+        # PyJWT only defines these when `cryptography` is installed.
+        from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+    except ImportError:
+        raise RuntimeError(f"JWT_ALGORITHM={algorithm} needs the `cryptography` package; pip install cryptography") from None
+    return serialization, OKPAlgorithm if algorithm == "EdDSA" else RSAAlgorithm
+
+
+@lru_cache(maxsize=8)
+def _build(algorithm: str, private_keys: tuple, public_keys: tuple) -> KeySet:
+    signing: Dict[str, Any] = {}
+    verifying: Dict[str, Any] = {}
+    jwks = []
+    if is_asymmetric(algorithm):
+        serialization, jwk_class = _crypto(algorithm)
+        for kid, value in private_keys:
+            signing[kid] = serialization.load_pem_private_key(_pem(value), password=None)
+            verifying[kid] = signing[kid].public_key()
+        for kid, value in public_keys:
+            verifying.setdefault(kid, serialization.load_pem_public_key(_pem(value)))
+        for kid, key in verifying.items():
+            jwk = jwk_class.to_jwk(key, as_dict=True)
+            jwk.update({"kid": kid, "use": "sig", "alg": algorithm})
+            jwks.append(jwk)
+    body = json.dumps({"keys": jwks}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    return KeySet(signing=signing, verifying=verifying, jwks=body, etag=etag)
+
+
+def current() -> KeySet:
+    """The key set for the current settings (rebuilt only when they change)."""
+    return _build(
+        settings.JWT_ALGORITHM,
+        tuple(settings.JWT_PRIVATE_KEYS.items()),
+        tuple(settings.JWT_PUBLIC_KEYS.items()),
+    )
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional, Tuple
+
+from starlette.requests import Request
+
+from app.config.settings import settings
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _request_from_stack(frame) -> Tuple[Optional[str], Optional[str]]:
+    """Find the innermost `request` local on the stack: (route, request_id)."""
+    while frame is not None:
+        request = frame.f_locals.get("request")
+        if isinstance(request, Request):
+            route = request.scope.get("route")
+            path = getattr(route, "path", None) or request.scope.get("path")
+            return path, getattr(request.state, "request_id", None)
+        frame = frame.f_back
+    return None, None
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """The innermost frame in our own code, else the innermost frame."""
+    for entry in reversed(stack):
+        if entry.filename.startswith(_APP_DIR):
+            return f"{os.path.relpath(entry.filename, os.path.dirname(_APP_DIR))}:{entry.lineno} in {entry.name}"
+    entry = stack[-1]
+    return f"{entry.filename}:{entry.lineno} in {entry.name}"
+
+
+class LoopWatchdog:
+    """Detect event-loop stalls from a monitor thread and name the culprit.
+
+    A heartbeat task stamps the time every few milliseconds. The monitor
+    thread wakes on a short interval; when the stamp is older than
+    `threshold_ms` it grabs the loop thread's current stack, logs it with
+    the active route and request id, and counts the stall against the call
+    site. The stall's full duration is added once the loop ticks again.
+    """
+
+    def __init__(self, threshold_ms: float = settings.LOOP_WATCHDOG_THRESHOLD_MS, max_sites: int = 200):
+        self.threshold = threshold_ms / 1000
+        self.max_sites = max_sites
+        self.sites: Dict[str, dict] = {}
+        self.stalls = 0
+        self._last_tick = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._current_site: Optional[str] = None
+        self._stall_started = 0.0
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _beat(self) -> None:
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self.threshold / 4)
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.threshold / 4):
+            stalled = time.monotonic() - self._last_tick
+            if stalled > self.threshold:
+                if self._current_site is None:
+                    self._capture(stalled)
+            elif self._current_site is not None:
+                self._finish()
+
+    def _capture(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        site = _call_site(stack)
+        route, request_id = _request_from_stack(frame)
+        self.stalls += 1
+        entry = self.sites.get(site)
+        if entry is None:
+            if len(self.sites) >= self.max_sites:
+                site = "<other>"
+                entry = self.sites.setdefault(site, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": {}})
+            else:
+                entry = self.sites[site] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": {}}
+        entry["count"] += 1
+        if route:
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+        self._current_site = site
+        self._stall_started = self._last_tick
+        logger.warning(
+            "Event loop blocked for more than %.0f ms at %s (route=%s request_id=%s)\n%s",
+            stalled * 1000, site, route, request_id, "".join(stack.format()),
+        )
+
+    def _finish(self) -> None:
+        # The first tick after the stall bounds how long the loop was blocked.
+        duration = (self._last_tick - self._stall_started) * 1000
+        entry = self.sites.get(self._current_site)
+        self._current_site = None
+        if entry is not None:
+            entry["total_ms"] += duration
+            entry["max_ms"] = max(entry["max_ms"], duration)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._heartbeat.cancel()
+        try:
+            await self._heartbeat
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat = None
+
+    def stats(self) -> dict:
+        top = sorted(self.sites.items(), key=lambda item: item[1]["count"], reverse=True)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "sites": {site: {**entry, "routes": dict(entry["routes"])} for site, entry in top[:20]},
+        }
+
+
+loop_watchdog = LoopWatchdog()
+metrics.register("loop_watchdog", loop_watchdog.stats)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+
+from app.config.settings import settings
+from app.db.database import AsyncSessionLocal
+from app.models.note import ArchivedNote, Note
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+_NOTES = Note.__table__
+_ARCHIVE = ArchivedNote.__table__
+
+
+class NoteArchiver:
+    """Move notes older than `max_age_days` from `notes` to `notes_archive`.
+
+    Every `interval` seconds the oldest notes are moved in batches of
+    `batch_size`: one short transaction copies a batch (ids kept, content
+    left encoded as stored) and deletes it from `notes`, then the archiver
+    sleeps `pause` seconds so requests get the database in between.
+
+    Batches walk `notes` in id order and stop at the first note that is
+    too young; notes without a `created_at` have no age and stay in
+    `notes`. NoteRepository reads both tables in one statement, so a
+    batch committing mid-request is either fully visible to it or not at
+    all. The newest note is never moved: SQLite gives a new row
+    max(id) + 1, and moving it could let a new note reuse an archived id.
+
+    Run it in one process only: two archivers would copy the same batch
+    and one of them would fail on the archive's primary key.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_age_days: int = settings.NOTES_ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.NOTES_ARCHIVE_BATCH_SIZE,
+        interval: float = settings.NOTES_ARCHIVE_INTERVAL_SECONDS,
+        pause: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self.runs = 0
+        self.batches = 0
+        self.archived = 0
+        self.failed = 0
+        self.last_run_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def archive_batch(self, cutoff: datetime) -> int:
+        """Move up to `batch_size` of the oldest notes created before `cutoff`."""
+        async with self.session_factory() as session:
+            newest = (await session.execute(select(func.max(_NOTES.c.id)))).scalar()
+            rows = await session.execute(
+                select(_NOTES.c.id, _NOTES.c.created_at)
+                .where(_NOTES.c.created_at.isnot(None))
+                .order_by(_NOTES.c.id)
+                .limit(self.batch_size)
+            )
+            ids = []
+            for note_id, created_at in rows:
+                if note_id == newest or created_at >= cutoff:
+                    break
+                ids.append(note_id)
+            if not ids:
+                return 0
+            columns = [c.name for c in _NOTES.columns]
+            await session.execute(
+                insert(_ARCHIVE).from_select(columns, select(*_NOTES.columns).where(_NOTES.c.id.in_(ids)))
+            )
+            await session.execute(delete(_NOTES).where(_NOTES.c.id.in_(ids)))
+            await session.commit()
+        self.batches += 1
+        self.archived += len(ids)
+        return len(ids)
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Archive everything currently eligible; returns the number of notes moved."""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.max_age_days)
+        start = time.perf_counter()
+        moved = 0
+        while True:
+            batch = await self.archive_batch(cutoff)
+            moved += batch
+            if batch < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        self.runs += 1
+        self.last_run_ms = (time.perf_counter() - start) * 1000
+        if moved:
+            logger.info("Archived %d notes older than %s", moved, cutoff.date())
+        return moved
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                self.failed += 1
+                logger.error("Note archival failed: %s", exc)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # A batch interrupted mid-transaction is rolled back whole.
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "max_age_days": self.max_age_days,
+            "runs": self.runs,
+            "batches": self.batches,
+            "archived": self.archived,
+            "failed": self.failed,
+            "last_run_ms": self.last_run_ms,
+        }
+
+
+note_archiver = NoteArchiver()
+metrics.register("note_archiver", note_archiver.stats)
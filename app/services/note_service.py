@@ -1,11 +1,61 @@
+from app.config.settings import settings
 from app.repositories.note_repository import NoteRepository
+from app.repositories.note_stats_repository import TOTAL, NoteStatsRepository, user_key
+from app.schemas.note import NoteResponse
+from app.utils import metrics
+from app.utils.single_flight import SingleFlight
+
+# Concurrent identical list requests share one query and validation pass.
+list_flight = SingleFlight(ttl=settings.SINGLE_FLIGHT_TTL_SECONDS)
+metrics.register("single_flight.notes_list", list_flight.stats)
+
 
 class NoteService:
     @staticmethod
-    async def create_note(db, data):
+    async def create_note(db, data, user_id: int | None = None):
         repo = NoteRepository()
-        return await repo.create(db, title=data.title, content=data.content)
+        note = await repo.create(db, title=data.title, content=data.content, user_id=user_id)
+        list_flight.invalidate()
+        return note
+
+    @staticmethod
+    async def notes_version(db, user_id: int):
+        return await NoteRepository.get_version(db, user_id)
+
+    @staticmethod
+    async def list_notes(db, user_id: int, skip: int, limit: int, fields: tuple[str, ...] | None = None):
+        """Full notes, or dicts holding only `fields` when given."""
+        async def load():
+            if fields:
+                return await NoteRepository.get_notes_partial(db, user_id, skip, limit, fields)
+            notes = await NoteRepository.get_notes(db, user_id, skip, limit)
+            return [NoteResponse.model_validate(n) for n in notes]
+
+        return await list_flight.do((db.bind, user_id, skip, limit, fields), load)
+
+    @staticmethod
+    async def get_note(db, user_id: int, note_id: int, fields: tuple[str, ...] | None = None):
+        if fields:
+            return await NoteRepository.get_note_partial(db, user_id, note_id, fields)
+        return await NoteRepository.get_note(db, user_id, note_id)
+
+    @staticmethod
+    async def get_notes_by_ids(db, user_id: int, ids: list[int]):
+        """Notes in request order (duplicates dropped) and the ids not found."""
+        ids = list(dict.fromkeys(ids))
+        found = {n.id: n for n in await NoteRepository.get_notes_by_ids(db, user_id, ids)}
+        notes = [NoteResponse.model_validate(found[i]) for i in ids if i in found]
+        missing = [i for i in ids if i not in found]
+        return notes, missing
+
+    @staticmethod
+    async def count_notes(db, user_id: int) -> int:
+        return await NoteStatsRepository.get(db, user_key(user_id))
 
     @staticmethod
-    async def list_notes(db, skip: int, limit: int):
-        return await NoteRepository.get_notes(db, skip, limit)
\ No newline at end of file
+    async def stats(db, user_id: int, days: int) -> dict:
+        return {
+            "total": await NoteStatsRepository.get(db, TOTAL),
+            "mine": await NoteStatsRepository.get(db, user_key(user_id)),
+            "per_day": await NoteStatsRepository.recent_days(db, days),
+        }
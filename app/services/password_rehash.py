@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Callable, Dict
+
+from app.config.settings import settings
+from app.db.database import AsyncSessionLocal
+from app.repositories.user_repository import UserRepository
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordRehasher:
+    """Replace outdated password hashes after a successful login.
+
+    `schedule()` returns at once; the new hash is computed in a thread and
+    written in its own session, so the login response never waits for it.
+    At most one rehash per user and `max_pending` overall are in flight;
+    anything beyond is skipped and retried on a later login. The write only
+    applies if the stored hash is still the one that was verified.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_pending: int = 64,
+        enabled: bool = settings.PASSWORD_REHASH_ON_LOGIN,
+    ):
+        self.session_factory = session_factory
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self.scheduled = 0
+        self.rehashed = 0
+        self.skipped = 0
+        self.stale = 0
+        self.failed = 0
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def schedule(self, user_id: int, old_hash: str, new_hash: Callable[[], str]) -> bool:
+        """Rehash `user_id` in the background; `new_hash` computes the replacement."""
+        if not self.enabled:
+            return False
+        if user_id in self._tasks or len(self._tasks) >= self.max_pending:
+            self.skipped += 1
+            return False
+        task = asyncio.create_task(self._rehash(user_id, old_hash, new_hash))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(user_id, None))
+        self.scheduled += 1
+        return True
+
+    async def _rehash(self, user_id: int, old_hash: str, new_hash: Callable[[], str]) -> None:
+        try:
+            hashed = await asyncio.to_thread(new_hash)
+            async with self.session_factory() as session:
+                replaced = await UserRepository(session).replace_password_hash(user_id, old_hash, hashed)
+                await session.commit()
+        except Exception as exc:
+            self.failed += 1
+            logger.error("Password rehash for user %s failed: %s", user_id, exc)
+            return
+        if replaced:
+            self.rehashed += 1
+        else:
+            self.stale += 1
+
+    async def drain(self) -> None:
+        """Wait for in-flight rehashes (used at shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._tasks),
+            "scheduled": self.scheduled,
+            "rehashed": self.rehashed,
+            "skipped": self.skipped,
+            "stale": self.stale,
+            "failed": self.failed,
+        }
+
+
+password_rehasher = PasswordRehasher()
+metrics.register("password_rehash", password_rehasher.stats)
@@ -1,16 +1,34 @@
 from datetime import datetime, timezone
 from app.config.settings import settings
+from app.utils import metrics
+from app.utils.http_cache import weak_etag
+from app.utils.single_flight import SingleFlight
+
+SERVICE_VERSION = "1.0.0"
+
+info_flight = SingleFlight(ttl=settings.SINGLE_FLIGHT_TTL_SECONDS)
+metrics.register("single_flight.service_info", info_flight.stats)
 
 
 class ServiceInfoService:
 
     async def get_info(self):
+        return await info_flight.do("info", self._build_info)
+
+    async def _build_info(self):
+        return self.info_payload()
+
+    def info_payload(self) -> dict:
         return {
             "name": settings.APP_NAME,
             "environment": settings.ENV,
-            "version": "1.0.0"
+            "version": SERVICE_VERSION
         }
 
+    def etag(self) -> str:
+        # The info payload only changes with configuration, i.e. on restart.
+        return weak_etag("info", settings.APP_NAME, settings.ENV, SERVICE_VERSION)
+
     async def get_time(self):
         return {
             "server_time": datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,254 @@
+"""Bulk user provisioning from CSV or NDJSON.
+
+Records are CSV with a header row naming at least `email`, `password` and
+`name` (quoted fields may span lines), or NDJSON objects with those keys,
+one per line. Each
+record is validated like `POST /auth/register` (the email doubles as the
+username). Passwords are hashed in a process pool while the previous chunk
+is being inserted; each chunk is one multi-row INSERT ... ON CONFLICT DO
+NOTHING RETURNING email in its own transaction, so duplicates (already
+registered, or repeated in the file) are reported from what the unique
+constraints rejected, without a lookup per user.
+"""
+import asyncio
+import csv
+import codecs
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.config.settings import settings
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import RegisterRequest
+from app.services.user_service import hash_password
+from app.utils import metrics
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/ndjson": "ndjson"}
+# Emails / errors kept in the report; the counts are always complete.
+REPORT_LIMIT = 100
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    conflicting_emails: List[str] = field(default_factory=list)
+    errors: List[dict] = field(default_factory=list)
+
+    def conflict(self, email: str) -> None:
+        self.conflicts += 1
+        if len(self.conflicting_emails) < REPORT_LIMIT:
+            self.conflicting_emails.append(email)
+
+    def error(self, line: int, message: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < REPORT_LIMIT:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "conflicts": self.conflicts,
+            "invalid": self.invalid,
+            "conflicting_emails": self.conflicting_emails,
+            "errors": self.errors,
+        }
+
+
+async def iter_lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Adapt a sync line source (an open file) to `import_users`."""
+    for line in lines:
+        yield line
+
+
+async def iter_body_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering all of it."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'record'}: {e['msg']}" for e in exc.errors())
+    return str(exc)
+
+
+async def _csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """(first line number, fields or csv.Error) per CSV record.
+
+    One csv.reader reads the whole body, so quoted fields may span lines. It
+    is only advanced once `pending` holds a complete record (an even number
+    of quote characters so far), so it never runs dry mid-record.
+    """
+    pending: Deque[str] = deque()
+    reader = csv.reader(iter(pending.popleft, None))
+    number = start = 0
+    quoted = False
+    async for line in lines:
+        number += 1
+        if number == 1:
+            line = line.lstrip("\ufeff")
+        if not quoted:
+            if not line.strip():
+                continue
+            start = number
+        pending.append(line.rstrip("\r\n") + "\n")
+        quoted ^= line.count('"') % 2 == 1
+        if not quoted:
+            try:
+                row = next(reader)
+            except csv.Error as exc:
+                row = exc
+            yield start, row
+    if quoted:
+        yield start, csv.Error("unterminated quoted field")
+
+
+async def _ndjson_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """(line number, object or JSONDecodeError) per non-blank line."""
+    number = 0
+    async for line in lines:
+        number += 1
+        line = line.strip().lstrip("\ufeff")
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+
+
+async def _records(lines: AsyncIterable[str], fmt: str, report: ImportReport) -> AsyncIterator[RegisterRequest]:
+    header: Optional[List[str]] = None
+    rows = _csv_rows(lines) if fmt == "csv" else _ndjson_rows(lines)
+    async for number, value in rows:
+        try:
+            if isinstance(value, Exception):
+                raise value
+            if fmt == "csv":
+                if header is None:
+                    header = [name.strip().lower() for name in value]
+                    continue
+                value = dict(zip(header, value))
+            yield RegisterRequest.model_validate(value)
+        # ValidationError and JSONDecodeError are ValueErrors.
+        except (ValueError, TypeError, csv.Error) as exc:
+            report.error(number, _error_message(exc))
+
+
+async def _chunks(records: AsyncIterator[RegisterRequest], size: int) -> AsyncIterator[List[RegisterRequest]]:
+    chunk: List[RegisterRequest] = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _insert(repo: UserRepository, chunk: List[RegisterRequest], hashes: List[str], report: ImportReport) -> None:
+    rows = [
+        {"username": r.email, "email": r.email, "name": r.name, "hashed_password": h}
+        for r, h in zip(chunk, hashes)
+    ]
+    inserted = set(await repo.insert_many(rows))
+    await repo.db.commit()
+    for r in chunk:
+        if r.email in inserted:
+            inserted.discard(r.email)  # a repeat later in the chunk is a conflict
+            report.inserted += 1
+        else:
+            report.conflict(r.email)
+
+
+def hashing_pool(workers: int = 0) -> ProcessPoolExecutor:
+    """A process pool for `import_users`.
+
+    Spawned rather than forked: the server process runs threads (aiosqlite,
+    watchdogs) whose locks a forked child could inherit held.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or settings.USER_IMPORT_WORKERS or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+class SharedHashingPool:
+    """The server's `hashing_pool`, created by the first import and reused.
+
+    Every spawned worker re-imports the app before it hashes anything, so
+    a pool per request would spend small imports on process start-up. An
+    import that hits BrokenProcessPool (a worker died) `discard`s the pool,
+    and the next one starts a fresh pool.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers
+        self.created = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = hashing_pool(self.workers)
+            self.created += 1
+        return self._pool
+
+    def discard(self, pool: Executor) -> None:
+        """Drop `pool` after it raised BrokenProcessPool."""
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False)
+
+    async def shutdown(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            # Worker shutdown joins processes; keep it off the loop.
+            await asyncio.to_thread(pool.shutdown)
+
+    def stats(self) -> dict:
+        return {"running": self._pool is not None, "created": self.created}
+
+
+import_pool = SharedHashingPool()
+metrics.register("user_import_pool", import_pool.stats)
+
+
+async def import_users(
+    db,
+    lines: AsyncIterable[str],
+    fmt: str,
+    pool: Executor,
+    chunk_size: int = 0,
+) -> ImportReport:
+    """Validate, hash and insert every record in `lines`; see the module docstring."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    loop = asyncio.get_running_loop()
+    repo = UserRepository(db)
+    report = ImportReport()
+    pending = None
+    async for chunk in _chunks(_records(lines, fmt, report), chunk_size or settings.USER_IMPORT_CHUNK_SIZE):
+        hashing = asyncio.gather(*(loop.run_in_executor(pool, hash_password, r.password) for r in chunk))
+        if pending is not None:
+            await _insert(repo, pending[0], await pending[1], report)
+        pending = (chunk, hashing)
+    if pending is not None:
+        await _insert(repo, pending[0], await pending[1], report)
+    return report
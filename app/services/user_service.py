@@ -1,19 +1,35 @@
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
+import functools
 import logging
+import time
 
+from app.config.settings import settings
 from app.repositories.user_repository import UserRepository
+from app.services.password_rehash import password_rehasher
 
 logger = logging.getLogger(__name__)
 
-# Enforce bcrypt hashing for passwords with 12 rounds. This makes the
-# hashing configuration explicit and consistent across environments. If your
+
+def _context(scheme: str, rounds: int) -> CryptContext:
+    """A context hashing with `scheme` at exactly `rounds`.
+
+    Hashes at any other cost, or (under bcrypt) sha256_crypt hashes from a
+    fallback deployment, verify but report `needs_update`.
+    """
+    schemes = [scheme] if scheme == "sha256_crypt" else [scheme, "sha256_crypt"]
+    cost = {f"{scheme}__{name}": rounds for name in ("default_rounds", "min_rounds", "max_rounds")}
+    return CryptContext(schemes=schemes, deprecated="auto", **cost)
+
+
+# Hash with bcrypt at PASSWORD_BCRYPT_ROUNDS when the backend works. If your
 # CI or deployment environment cannot build bcrypt, install the prebuilt
-# wheel or add the OS packages required to compile it.
+# wheel or add the OS packages required to compile it; until then
+# sha256_crypt (at PASSWORD_SHA256_ROUNDS) is used instead.
 _use_bcrypt = False
 try:
     # try to configure bcrypt with desired rounds and verify it works
-    _ctx = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12, deprecated="auto")
+    _ctx = _context("bcrypt", settings.PASSWORD_BCRYPT_ROUNDS)
     try:
         _sample = _ctx.hash("test")
         if _ctx.verify("test", _sample):
@@ -23,10 +39,10 @@ try:
             raise RuntimeError("bcrypt backend verify failed")
     except Exception:
         logger.warning("bcrypt present but failed to operate correctly; falling back to sha256_crypt")
-        _real_ctx = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+        _real_ctx = _context("sha256_crypt", settings.PASSWORD_SHA256_ROUNDS)
 except Exception:
     logger.warning("bcrypt not available; falling back to sha256_crypt for hashing")
-    _real_ctx = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+    _real_ctx = _context("sha256_crypt", settings.PASSWORD_SHA256_ROUNDS)
 
 
 def _truncate_for_bcrypt(pw: str) -> str:
@@ -38,22 +54,66 @@ def _truncate_for_bcrypt(pw: str) -> str:
 
 
 class _PwdContextWrapper:
-    def __init__(self, ctx: CryptContext, use_bcrypt: bool):
+    def __init__(self, ctx: CryptContext):
         self._ctx = ctx
-        self._use_bcrypt = use_bcrypt
 
+    @property
+    def scheme(self) -> str:
+        return self._ctx.default_scheme()
+
+    # Every scheme hashes and verifies the password truncated to bcrypt's
+    # 72 bytes, so a hash made on any path (registration, import, rehash on
+    # login) verifies on every other, whichever scheme made it.
     def hash(self, password: str) -> str:
-        if self._use_bcrypt:
-            return self._ctx.hash(_truncate_for_bcrypt(password))
-        return self._ctx.hash(password)
+        return self._ctx.hash(_truncate_for_bcrypt(password))
 
     def verify(self, password: str, hashed: str) -> bool:
-        if self._use_bcrypt:
-            return self._ctx.verify(_truncate_for_bcrypt(password), hashed)
-        return self._ctx.verify(password, hashed)
+        return self._ctx.verify(_truncate_for_bcrypt(password), hashed)
+
+    def needs_update(self, hashed: str) -> bool:
+        """True for hashes made with another scheme or cost than the current one."""
+        return self._ctx.needs_update(hashed)
+
+
+pwd_context = _PwdContextWrapper(_real_ctx)
+
 
+def calibrate_rounds(target_ms: float, scheme: str | None = None, samples: int = 3) -> tuple[int, float]:
+    """The highest cost whose verify time stays within `target_ms` here.
 
-pwd_context = _PwdContextWrapper(_real_ctx, _use_bcrypt)
+    Returns (rounds, measured verify ms) for `scheme` (default: the scheme in
+    use). bcrypt's cost is log2, so each round doubles the time; sha256_crypt
+    scales linearly with its rounds.
+    """
+    scheme = scheme or pwd_context.scheme
+
+    def verify_ms(rounds: int) -> float:
+        ctx = _context(scheme, rounds)
+        hashed = ctx.hash("calibrate")
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            ctx.verify("calibrate", hashed)
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
+
+    if scheme == "bcrypt":
+        rounds, elapsed = 4, verify_ms(4)
+        while rounds < 31:
+            longer = verify_ms(rounds + 1)
+            if longer > target_ms:
+                break
+            rounds, elapsed = rounds + 1, longer
+        return rounds, elapsed
+
+    probe = 20_000
+    rounds = max(1000, int(probe * target_ms / verify_ms(probe)))
+    return rounds, verify_ms(rounds)
+
+
+def hash_password(password: str) -> str:
+    """Module-level so process pools can pickle it (see app/services/user_import.py)."""
+    return pwd_context.hash(password)
 
 
 class UserService:
@@ -61,30 +121,22 @@ class UserService:
         self.repo = UserRepository(db)
 
     async def register_user(self, username: str, email: str, name: str | None, password: str):
-        # Hash password and create user
-        # bcrypt has a 72-byte input limit. To avoid RuntimeError from the
-        # underlying C library (and to keep behavior deterministic), truncate
-        # to 72 bytes when encoding to UTF-8. This preserves compatibility
-        # with bcrypt while making the behavior explicit.
-        pw_bytes = password.encode("utf-8")
-        if len(pw_bytes) > 72:
-            pw_to_hash = pw_bytes[:72].decode("utf-8", errors="ignore")
-        else:
-            pw_to_hash = password
-        hashed = pwd_context.hash(pw_to_hash)
+        # Hash password and create user. bcrypt has a 72-byte input limit;
+        # pwd_context truncates to it (UTF-8) for every scheme.
+        hashed = hash_password(password)
         return await self.repo.create_user(username, email, name, hashed)
 
     async def authenticate(self, identifier: str, password: str) -> bool:
         # Accept either username or email as identifier
-        user = await self.repo.get_by_username(identifier)
-        if not user:
-            user = await self.repo.get_by_email(identifier)
-        if not user:
+        # Only the hash is needed, so no User entity is loaded.
+        credentials = await self.repo.get_credentials(identifier)
+        if credentials is None:
             return False
-        # Apply same truncation when verifying passwords against bcrypt.
-        pw_bytes = password.encode("utf-8")
-        if len(pw_bytes) > 72:
-            pw_to_verify = pw_bytes[:72].decode("utf-8", errors="ignore")
-        else:
-            pw_to_verify = password
-        return pwd_context.verify(pw_to_verify, user.hashed_password)
+        if not pwd_context.verify(password, credentials.hashed_password):
+            return False
+        if pwd_context.needs_update(credentials.hashed_password):
+            # Stored with an old scheme or cost: upgrade it in the background.
+            password_rehasher.schedule(
+                credentials.id, credentials.hashed_password, functools.partial(hash_password, password)
+            )
+        return True
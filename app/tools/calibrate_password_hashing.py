@@ -0,0 +1,31 @@
+"""Find the password hashing cost that fits a target verify time here.
+
+Run on the hardware that will serve logins:
+
+    python -m app.tools.calibrate_password_hashing
+    python -m app.tools.calibrate_password_hashing --target-ms 100 --scheme bcrypt
+
+It prints the setting to pin (PASSWORD_BCRYPT_ROUNDS or
+PASSWORD_SHA256_ROUNDS). Existing hashes move to the new cost as their
+users log in.
+"""
+import argparse
+
+from app.config.settings import settings
+from app.services.user_service import calibrate_rounds, pwd_context
+
+SETTINGS = {"bcrypt": "PASSWORD_BCRYPT_ROUNDS", "sha256_crypt": "PASSWORD_SHA256_ROUNDS"}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.calibrate_password_hashing", description=__doc__.split("\n")[0])
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_TARGET_VERIFY_MS)
+    parser.add_argument("--scheme", choices=list(SETTINGS), default=pwd_context.scheme)
+    args = parser.parse_args(argv)
+    rounds, elapsed = calibrate_rounds(args.target_ms, args.scheme)
+    current = getattr(settings, SETTINGS[args.scheme])
+    print(f"{SETTINGS[args.scheme]}={rounds}  # verify {elapsed:.0f} ms (target {args.target_ms:.0f} ms, now {current})")
+
+
+if __name__ == "__main__":
+    main()
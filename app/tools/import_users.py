@@ -0,0 +1,60 @@
+"""Provision users in bulk from a CSV or NDJSON file.
+
+    python -m app.tools.import_users users.csv
+    python -m app.tools.import_users users.ndjson --workers 8 --chunk-size 1000
+    python -m app.tools.import_users - --format ndjson < users.ndjson
+
+The format is taken from the file extension unless --format is given. See
+app/services/user_import.py for the record layout. The report (counts plus
+the first conflicting emails and invalid lines) is printed as JSON.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import settings
+from app.db.database import DATABASE_URL, Base
+from app.services.user_import import FORMATS, hashing_pool, import_users, iter_lines
+
+
+async def run(database_url: str, source, fmt: str, workers: int, chunk_size: int) -> dict:
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        with hashing_pool(workers) as pool:
+            async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+                report = await import_users(session, iter_lines(source), fmt, pool, chunk_size)
+        return report.as_dict()
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.import_users", description=__doc__.split("\n")[0])
+    parser.add_argument("path", help="CSV / NDJSON file, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--workers", type=int, default=settings.USER_IMPORT_WORKERS, help="hashing processes (0 = one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=settings.USER_IMPORT_CHUNK_SIZE, help="users per transaction")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson" if args.path.endswith((".ndjson", ".jsonl")) else None)
+    if fmt is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    try:
+        report = asyncio.run(run(args.database_url, source, fmt, args.workers, args.chunk_size))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Recompute the note counters from the notes table.
+
+Run after bulk loads that bypass NoteRepository, or whenever the counters
+are suspected to have drifted:
+
+    python -m app.tools.rebuild_note_counters
+    python -m app.tools.rebuild_note_counters --database-url sqlite+aiosqlite:///./other.db
+"""
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import DATABASE_URL, Base
+from app.models import user  # noqa: F401  (notes.user_id references users)
+from app.repositories.note_stats_repository import NoteStatsRepository
+
+
+async def rebuild(database_url: str) -> int:
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            return await NoteStatsRepository.rebuild(session)
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.rebuild_note_counters", description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args(argv)
+    total = asyncio.run(rebuild(args.database_url))
+    print(f"note counters rebuilt: {total} notes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Rewrite stored note content with the current compression settings.
+
+Walks `notes` and `notes_archive` by id in batches, committing after each one so the
+write lock is held only briefly and the app can keep serving. Rows already
+stored the way the settings would store them are left alone, so the job can
+be re-run at any time (for example after changing NOTES_COMPRESSION or
+NOTES_COMPRESSION_MIN_BYTES, or to compress rows written before compression
+existed):
+
+    python -m app.tools.recompress_notes
+    python -m app.tools.recompress_notes --codec lzma --vacuum
+    python -m app.tools.recompress_notes --codec none   # decompress everything
+
+SQLite does not shrink the database file on its own; pass --vacuum to
+reclaim the freed pages afterwards.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import settings
+from app.db.database import DATABASE_URL
+from app.models import user  # noqa: F401  (notes.user_id references users)
+from app.models.note import ArchivedNote, Note
+from app.utils import content_codec
+
+
+async def recompress(db, codec: str | None = None, min_bytes: int | None = None, batch_size: int = 500) -> dict:
+    """Re-encode every note's content, archived notes included; returns row and byte counts."""
+    report = {"rows": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+    for model in (Note, ArchivedNote):
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(model.id, model._content).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for note_id, stored in rows:
+                wanted = content_codec.encode(content_codec.decode(stored), codec=codec, min_bytes=min_bytes)
+                report["rows"] += 1
+                report["bytes_before"] += content_codec.stored_size(stored)
+                report["bytes_after"] += content_codec.stored_size(wanted)
+                if wanted != stored:
+                    await db.execute(update(model).where(model.id == note_id).values({model._content: wanted}))
+                    report["rewritten"] += 1
+            await db.commit()
+            last_id = rows[-1][0]
+    return report
+
+
+async def run(database_url: str, codec: str, min_bytes: int, batch_size: int, vacuum: bool) -> dict:
+    engine = create_async_engine(database_url)
+    try:
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            report = await recompress(session, codec=codec, min_bytes=min_bytes, batch_size=batch_size)
+        if vacuum:
+            async with engine.connect() as conn:
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM"))
+        return report
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.recompress_notes", description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--codec", choices=["none", "zlib", "lzma"], default=settings.NOTES_COMPRESSION)
+    parser.add_argument("--min-bytes", type=int, default=settings.NOTES_COMPRESSION_MIN_BYTES)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the database afterwards")
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.database_url, args.codec, args.min_bytes, args.batch_size, args.vacuum))
+    print(
+        f"notes recompressed: {report['rewritten']} of {report['rows']} rewritten, "
+        f"content {report['bytes_before']} -> {report['bytes_after']} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
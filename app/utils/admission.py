@@ -0,0 +1,154 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class ConcurrencyLimiter:
+    """Concurrency gate with a bounded wait queue and an AIMD-adapted limit.
+
+    At most ``limit`` requests run at once. Further requests wait in a FIFO
+    queue of at most ``max_queue`` entries for up to ``queue_timeout``
+    seconds; anything beyond that is rejected straight away so callers can
+    shed load with a fast 503 instead of piling up work.
+
+    When ``target_latency`` (seconds) is set the limit adapts to measured
+    latency: each slow completion shrinks the limit multiplicatively and each
+    fast one grows it additively, never above the configured ``limit``.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int = 0,
+        queue_timeout: float = 0.0,
+        target_latency: Optional[float] = None,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+    ):
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.limit = float(limit)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed. Return False when shed."""
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue or self.queue_timeout <= 0:
+            self.rejected += 1
+            return False
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(fut)
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just before we were cancelled.
+                self.release()
+            else:
+                self._discard(fut)
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """Give a slot back and, if a latency is given, adapt the limit."""
+        self.in_flight -= 1
+        if latency is not None and self.target_latency:
+            if latency > self.target_latency:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_capacity():
+            fut = self._waiters.popleft()
+            if fut.done():
+                continue
+            # Hand the slot straight to the waiter so nobody can jump the queue.
+            self.in_flight += 1
+            fut.set_result(None)
+
+    def _discard(self, fut: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    """Map request paths to route groups, each with its own limiter.
+
+    Health probes get a dedicated group so they always have a reserved slot,
+    however saturated the expensive groups are.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        routes: Dict[str, str],
+        max_queue: int = 0,
+        queue_timeout: float = 0.0,
+        target_latency_ms: Optional[Dict[str, float]] = None,
+        default_group: str = "default",
+    ):
+        target_latency_ms = target_latency_ms or {}
+        self.default_group = default_group
+        # Longest prefix first so "/auth/token" wins over "/auth".
+        self.routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        self.limiters: Dict[str, ConcurrencyLimiter] = {}
+        for group, limit in limits.items():
+            target = target_latency_ms.get(group)
+            self.limiters[group] = ConcurrencyLimiter(
+                limit=limit,
+                max_queue=max_queue,
+                queue_timeout=queue_timeout,
+                target_latency=target / 1000 if target else None,
+            )
+
+    def group_for(self, path: str) -> str:
+        for prefix, group in self.routes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return group
+        return self.default_group
+
+    def limiter_for(self, path: str) -> Optional[ConcurrencyLimiter]:
+        return self.limiters.get(self.group_for(path))
+
+    def stats(self) -> dict:
+        return {group: limiter.stats() for group, limiter in self.limiters.items()}
@@ -0,0 +1,81 @@
+"""Storage codec for note content.
+
+Content at or above NOTES_COMPRESSION_MIN_BYTES (UTF-8) is stored as a BLOB:
+one version byte naming the codec, then the compressed UTF-8 text. Anything
+smaller, or anything that does not shrink, stays a plain TEXT value, so rows
+written before compression existed (or with it turned off) read unchanged.
+
+    0x01 + zlib stream
+    0x02 + xz stream (lzma)
+"""
+import lzma
+import zlib
+from typing import Callable, Dict, Tuple
+
+from app.config.settings import settings
+
+ZLIB = 0x01
+LZMA = 0x02
+
+_COMPRESSORS: Dict[str, Tuple[int, Callable[[bytes, int], bytes]]] = {
+    "zlib": (ZLIB, lambda data, level: zlib.compress(data, level)),
+    "lzma": (LZMA, lambda data, level: lzma.compress(data, preset=level)),
+}
+_DECOMPRESSORS: Dict[int, Callable[[], object]] = {
+    ZLIB: zlib.decompressobj,
+    LZMA: lzma.LZMADecompressor,
+}
+
+
+def encode(text: str, codec: str | None = None, min_bytes: int | None = None, level: int | None = None) -> str | bytes:
+    """The value to store for `text`; arguments default to the NOTES_COMPRESSION* settings."""
+    codec = settings.NOTES_COMPRESSION if codec is None else codec
+    min_bytes = settings.NOTES_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if codec == "none":
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < min_bytes:
+        return text
+    version, compress = _COMPRESSORS[codec]
+    packed = bytes((version,)) + compress(raw, settings.NOTES_COMPRESSION_LEVEL if level is None else level)
+    return packed if len(packed) < len(raw) else text
+
+
+def _decompressor(value: bytes):
+    try:
+        return _DECOMPRESSORS[value[0]]()
+    except (IndexError, KeyError):
+        raise ValueError(f"unknown note content encoding {value[:1]!r}") from None
+
+
+def decode(value: str | bytes | None) -> str | None:
+    """Inverse of `encode`; plain text is returned as-is."""
+    if value is None or isinstance(value, str):
+        return value
+    return _decompressor(value).decompress(bytes(value[1:])).decode("utf-8")
+
+
+def decode_prefix(value: str | bytes | None, chars: int) -> str | None:
+    """The first `chars` characters, decompressing no more than needed."""
+    if value is None or isinstance(value, str):
+        return value and value[:chars]
+    # A character is at most 4 UTF-8 bytes; a character cut at the end is dropped.
+    data = _decompressor(value).decompress(bytes(value[1:]), max_length=chars * 4)
+    return data.decode("utf-8", errors="ignore")[:chars]
+
+
+def prefix_bytes(chars: int) -> int:
+    """Stored bytes always enough for `decode_prefix(value, chars)`.
+
+    `chars` characters are at most 4 UTF-8 bytes each, and neither codec
+    spends more than two bytes per input byte on them; the rest covers the
+    version byte and stream/block headers.
+    """
+    return 1 + chars * 8 + 512
+
+
+def stored_size(value: str | bytes | None) -> int:
+    """Bytes a stored value takes in the database (UTF-8 for text)."""
+    if value is None:
+        return 0
+    return len(value) if isinstance(value, (bytes, bytearray)) else len(value.encode("utf-8"))
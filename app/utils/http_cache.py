@@ -0,0 +1,34 @@
+import hashlib
+from fastapi import Request, Response
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from cheap version markers (ids, counters, settings).
+
+    Only the small parts are hashed, never the response body.
+    """
+    raw = "|".join(str(p) for p in parts).encode("utf-8")
+    return 'W/"%s"' % hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `If-None-Match` against the current ETag."""
+    return if_none_match(request.headers.get("if-none-match"), etag)
+
+
+def if_none_match(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == current for candidate in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -0,0 +1,24 @@
+from typing import Callable, Dict
+
+# Named stats providers (admission limits, single-flight counters, DB probe,
+# runtime diagnostics, ...). Components register themselves at import time
+# and `/internal/metrics` reports them all.
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, provider: Callable[[], dict]) -> None:
+    _providers[name] = provider
+
+
+def unregister(name: str) -> None:
+    _providers.pop(name, None)
+
+
+def snapshot() -> dict:
+    out = {}
+    for name, provider in _providers.items():
+        try:
+            out[name] = provider()
+        except Exception as exc:  # one broken provider must not hide the rest
+            out[name] = {"error": type(exc).__name__}
+    return out
@@ -0,0 +1,35 @@
+from contextvars import ContextVar, Token
+from typing import Optional
+
+
+class RequestContext:
+    """Per-request accumulators shared by middleware, DB events and responses.
+
+    The object is set once per request in a ContextVar; tasks and greenlets
+    spawned for the request inherit the same instance, so timings added deep
+    in the call stack are visible to the middleware afterwards.
+    """
+
+    __slots__ = ("request_id", "path", "db_time", "db_queries", "serialize_time")
+
+    def __init__(self, request_id: Optional[str] = None, path: Optional[str] = None):
+        self.request_id = request_id
+        self.path = path
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.serialize_time = 0.0
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def begin(request_id: str, path: str) -> Token:
+    return _current.set(RequestContext(request_id, path))
+
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestContext]:
+    return _current.get()
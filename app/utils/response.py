@@ -1,5 +1,9 @@
+import time
 from typing import Any
 from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.utils import request_context
 
 
 def success_response(
@@ -12,3 +16,15 @@ def success_response(
         "data": data,
         "request_id": request.state.request_id
     }
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that charges its encoding time to the current request."""
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        ctx = request_context.current()
+        if ctx is not None:
+            ctx.serialize_time += time.perf_counter() - start
+        return body
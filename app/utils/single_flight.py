@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Set as the shared result when the leader is cancelled; followers retry.
+_ABANDONED = object()
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight computation.
+
+    The first caller for a key runs ``fn``; callers arriving while it is
+    still running await the same future and share its result (or error).
+    With ``ttl`` > 0 the result is also kept for that many seconds, so a
+    burst that arrives just after the computation finished is served too.
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self._generation = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        while True:
+            if self.ttl > 0:
+                cached = self._results.get(key)
+                if cached is not None:
+                    if cached[0] > time.monotonic():
+                        self.cache_hits += 1
+                        return cached[1]
+                    del self._results[key]
+
+            fut = self._inflight.get(key)
+            if fut is None:
+                return await self._lead(key, fn)
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the shared call.
+            result = await asyncio.shield(fut)
+            if result is not _ABANDONED:
+                return result
+            # The leader was cancelled (e.g. its client went away); this
+            # caller was not, so it runs the call itself or joins whoever does.
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        self.executed += 1
+        generation = self._generation
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            fut.set_result(_ABANDONED)
+            raise
+        except Exception as exc:
+            fut.set_exception(exc)
+            # Mark retrieved so an error nobody else awaited is not logged.
+            fut.exception()
+            raise
+        else:
+            fut.set_result(result)
+            # A result computed across an invalidate() may predate the write.
+            if self.ttl > 0 and generation == self._generation:
+                self._results[key] = (time.monotonic() + self.ttl, result)
+            return result
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def invalidate(self) -> None:
+        """Forget cached results and detach in-flight calls after a write."""
+        self._generation += 1
+        self._results.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "in_flight": len(self._inflight),
+        }
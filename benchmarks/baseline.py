@@ -0,0 +1,68 @@
+"""Save benchmark results as JSON baselines and gate new runs against them.
+
+Results are nested dicts whose leaves are metric dicts (for example
+``{"rps": 812.0, "p95_ms": 14.2}``). `compare` walks both trees and reports
+every shared metric that moved the wrong way by more than the tolerance.
+"""
+import json
+import platform
+import subprocess
+import sys
+from typing import Dict, List
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def save(path: str, results: dict) -> None:
+    meta = {
+        "git": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def _leaves(tree: dict, checks: Dict[str, str], prefix: str = ""):
+    for key, value in tree.items():
+        if not isinstance(value, dict):
+            continue
+        name = f"{prefix}/{key}" if prefix else key
+        if checks.keys() & value.keys():
+            yield name, value
+        else:
+            yield from _leaves(value, checks, name)
+
+
+def compare(current: dict, baseline: dict, checks: Dict[str, str], tolerance: float) -> List[str]:
+    """Regressions of `current` against `baseline`.
+
+    `checks` maps a metric name to "lower" or "higher" (which direction is
+    better). Entries present in only one of the trees are ignored.
+    """
+    base = dict(_leaves(baseline, checks))
+    regressions = []
+    for name, metrics in _leaves(current, checks):
+        old = base.get(name)
+        if old is None:
+            continue
+        for metric, better in checks.items():
+            new_value, old_value = metrics.get(metric), old.get(metric)
+            if new_value is None or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            if (better == "lower" and change > tolerance) or (better == "higher" and -change > tolerance):
+                regressions.append(f"{name} {metric}: {old_value:.4g} -> {new_value:.4g} ({change:+.1%})")
+    return regressions
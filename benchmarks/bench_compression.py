@@ -0,0 +1,105 @@
+"""CPU-versus-bytes benchmark for response compression.
+
+Compresses typical `GET /notes` envelopes (10, 50 and 200 notes with short
+and long content) with every available encoder and level, and reports the
+median time per body, compressed size and ratio. The last section compares
+a full gzip of a `/service/info`-style body against the static prefix cache.
+
+Run with:
+
+    python -m benchmarks.bench_compression
+"""
+import json
+import random
+import statistics
+import string
+import time
+import uuid
+
+from app.middleware.compression import ENCODERS, StaticBodyCache
+
+LEVELS = (1, 6, 9)
+REPEAT = 50
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(n))
+
+
+def note_envelope(count: int, words: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    notes = [
+        {
+            "title": _words(rng, 4),
+            "content": _words(rng, words),
+            "id": i + 1,
+            "created_at": "2026-10-19T12:00:00.000000",
+        }
+        for i in range(count)
+    ]
+    body = {"success": True, "data": notes, "request_id": str(uuid.uuid4())}
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def _median_ms(fn) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench_payloads() -> None:
+    print(f"{'payload':<18}{'encoding':<10}{'level':>6}{'bytes in':>10}{'bytes out':>11}{'ratio':>8}{'ms':>9}{'MB/s':>9}")
+    for count, words in ((10, 20), (50, 20), (200, 20), (10, 400), (50, 400)):
+        body = note_envelope(count, words)
+        label = f"{count} notes x {words}w"
+        for encoding, factory in ENCODERS.items():
+            for level in LEVELS:
+                def run():
+                    enc = factory(level)
+                    return enc.compress(body) + enc.finish()
+
+                out = run()
+                ms = _median_ms(run)
+                mbps = len(body) / (ms / 1000) / 1e6 if ms else float("inf")
+                print(
+                    f"{label:<18}{encoding:<10}{level:>6}{len(body):>10}{len(out):>11}"
+                    f"{len(body) / len(out):>8.2f}{ms:>9.3f}{mbps:>9.1f}"
+                )
+
+
+def bench_static_prefix() -> None:
+    info = {"name": "WEQ API", "environment": "prod", "version": "1.0.0", "description": _words(random.Random(1), 150)}
+
+    def body() -> bytes:
+        return json.dumps({"success": True, "data": info, "request_id": str(uuid.uuid4())}, separators=(",", ":")).encode()
+
+    bodies = [body() for _ in range(REPEAT)]
+    cache = StaticBodyCache()
+    for b in bodies[:3]:  # learn the constant prefix
+        cache.compress("/service/info", "gzip", b, 6)
+
+    def run(fn) -> float:
+        samples = []
+        for b in bodies:
+            start = time.perf_counter()
+            fn(b)
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1e6
+
+    def full(b):
+        enc = ENCODERS["gzip"](6)
+        return enc.compress(b) + enc.finish()
+
+    print()
+    print(f"static body ({len(bodies[0])} bytes), gzip level 6")
+    print(f"  full compress    {run(full):8.1f} us  {len(full(bodies[0]))} bytes")
+    print(f"  prefix cache     {run(lambda b: cache.compress('/service/info', 'gzip', b, 6)):8.1f} us"
+          f"  {len(cache.compress('/service/info', 'gzip', bodies[0], 6))} bytes")
+
+
+if __name__ == "__main__":
+    bench_payloads()
+    bench_static_prefix()
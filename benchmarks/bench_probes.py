@@ -0,0 +1,89 @@
+"""Per-probe cost of the health/service fast path versus the routed path.
+
+Calls the ASGI app directly (no HTTP client or socket) so the numbers show
+the application's own cost. The "floor" row is a bare ASGI app that sends a
+constant body: the least any ASGI response can cost.
+
+Run with:
+
+    python -m benchmarks.bench_probes
+"""
+import asyncio
+import statistics
+import time
+
+from app.main import app
+from app.middleware.probes import ProbeFastPathMiddleware
+
+PATHS = ["/health", "/health/ping", "/health/live", "/health/ready", "/service/info"]
+BATCH = 500
+ROUNDS = 15
+
+
+async def floor_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"status":"ok"}'})
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+        "state": {},
+    }
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def per_call_us(asgi_app, path: str) -> float:
+    scope = _scope(path)
+    for _ in range(50):  # warmup
+        await asgi_app(dict(scope), _receive, _send)
+    rounds = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(BATCH):
+            await asgi_app(dict(scope), _receive, _send)
+        rounds.append((time.perf_counter() - start) / BATCH * 1e6)
+    return statistics.median(rounds)
+
+
+def _fast_path_layer() -> ProbeFastPathMiddleware:
+    layer = app.build_middleware_stack()
+    app.middleware_stack = layer
+    while not isinstance(layer, ProbeFastPathMiddleware):
+        layer = layer.app
+    return layer
+
+
+async def main() -> None:
+    fast_path = _fast_path_layer()
+    floor = await per_call_us(floor_app, "/health")
+    print(f"{'path':<16}{'floor us':>10}{'fast us':>10}{'routed us':>11}{'speedup':>9}")
+    for path in PATHS:
+        fast_path.enabled = True
+        fast = await per_call_us(app, path)
+        fast_path.enabled = False
+        routed = await per_call_us(app, path)
+        print(f"{path:<16}{floor:>10.2f}{fast:>10.2f}{routed:>11.2f}{routed / fast:>8.1f}x")
+    fast_path.enabled = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,307 @@
+"""End-to-end load scenarios against the full app, with regression gates.
+
+Concurrent virtual users drive `app.main.app` either in process through
+`httpx.ASGITransport` or over a real socket against a uvicorn server in a
+child process. Each run uses a fresh temporary SQLite database, seeded with
+one user who owns PAGINATION_ROWS notes.
+
+Scenarios:
+
+    login       login storm: POST /auth/token, each attempt from a new client IP
+    protected   authenticated GET /protected reads
+    notes       80/20 mix of GET /notes/ and POST /notes/
+    pagination  GET /notes/ at deep offsets
+
+For each endpoint the report shows requests, errors, RPS and p50/p95/p99
+latency. `--compare` exits with status 1 when any endpoint's RPS drops, or
+its p95 rises, by more than the tolerance, or when its error rate grows.
+
+Run with:
+
+    python -m benchmarks.load
+    python -m benchmarks.load --transport uvicorn --scenario notes pagination
+    python -m benchmarks.load --save load-baseline.json
+    python -m benchmarks.load --compare load-baseline.json --tolerance 0.25
+
+Baselines are machine-specific; record them on the machine that compares.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, get_db
+from app.db.instrumentation import instrument_engine
+from app.main import app
+from app.models.note import Note
+from app.models.user import User
+from app.repositories.note_stats_repository import NoteStatsRepository
+from app.services.auth_service import create_access_token
+from app.services.user_service import pwd_context
+from benchmarks import baseline
+
+USERNAME = "load@example.com"
+PASSWORD = "LoadTest123"
+PAGINATION_ROWS = 5000
+CHECKS = {"rps": "higher", "p95_ms": "lower"}
+
+Step = Callable[[httpx.AsyncClient, int], Awaitable[tuple]]
+
+# Under load every statement waits behind CPU-bound work on the loop, so the
+# slow-query log would drown the report.
+logging.getLogger("app.db.instrumentation").setLevel(logging.ERROR)
+
+
+def use_database(path: str):
+    """Point the app's `get_db` at a SQLite file; returns (engine, sessionmaker)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    instrument_engine(engine)
+    sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_bench_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_bench_db
+    return engine, sessions
+
+
+async def seed(path: str, notes: int = PAGINATION_ROWS) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        user_id = (await conn.execute(
+            insert(User)
+            .values(username=USERNAME, email=USERNAME, name="Load", hashed_password=pwd_context.hash(PASSWORD))
+            .returning(User.id)
+        )).scalar()
+        await conn.execute(
+            insert(Note),
+            [{"title": f"note {i}", "content": f"seeded content {i} " * 8, "user_id": user_id} for i in range(notes)],
+        )
+    # The bulk insert bypasses the repository, so build the counters after it.
+    async with sessionmaker(engine, class_=AsyncSession)() as session:
+        await NoteStatsRepository.rebuild(session)
+    await engine.dispose()
+
+
+def _client_ip(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+async def login(client: httpx.AsyncClient, i: int) -> tuple:
+    # A fresh IP per attempt keeps the per-IP login rate limiter out of the way.
+    r = await client.post(
+        "/auth/token",
+        json={"username": USERNAME, "password": PASSWORD},
+        headers={"X-Forwarded-For": _client_ip(i)},
+    )
+    return "POST /auth/token", r
+
+
+async def protected(client: httpx.AsyncClient, i: int) -> tuple:
+    return "GET /protected", await client.get("/protected")
+
+
+async def notes_mix(client: httpx.AsyncClient, i: int) -> tuple:
+    if i % 5 == 0:
+        r = await client.post("/notes/", json={"title": f"load {i}", "content": "written under load " * 4})
+        return "POST /notes/", r
+    return "GET /notes/", await client.get("/notes/", params={"skip": 0, "limit": 10})
+
+
+async def deep_pagination(client: httpx.AsyncClient, i: int) -> tuple:
+    skip = random.Random(i).randrange(PAGINATION_ROWS // 2, PAGINATION_ROWS)
+    return "GET /notes/?skip=deep", await client.get("/notes/", params={"skip": skip, "limit": 50})
+
+
+SCENARIOS: Dict[str, Step] = {
+    "login": login,
+    "protected": protected,
+    "notes": notes_mix,
+    "pagination": deep_pagination,
+}
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run_scenario(client: httpx.AsyncClient, step: Step, requests: int, users: int) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    counter = iter(range(requests))
+
+    async def user():
+        for i in counter:
+            start = time.perf_counter()
+            label, response = await step(client, i)
+            latencies[label].append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors[label] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    elapsed = time.perf_counter() - start
+
+    report = {}
+    for label, samples in latencies.items():
+        ordered = sorted(samples)
+        report[label] = {
+            "requests": len(samples),
+            "errors": errors[label],
+            "error_rate": errors[label] / len(samples),
+            "rps": len(samples) / elapsed,
+            "p50_ms": statistics.median(ordered),
+            "p95_ms": _percentile(ordered, 0.95),
+            "p99_ms": _percentile(ordered, 0.99),
+        }
+    return report
+
+
+async def _warm(client: httpx.AsyncClient, scenarios: List[str]) -> None:
+    for name in scenarios:
+        for i in range(10):
+            await SCENARIOS[name](client, -1 - i)
+
+
+async def run_asgi(scenarios: List[str], requests: int, users: int) -> dict:
+    token = create_access_token(USERNAME)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}) as client:
+        await _warm(client, scenarios)
+        return {name: await run_scenario(client, SCENARIOS[name], requests, users) for name in scenarios}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_uvicorn(db_path: str, scenarios: List[str], requests: int, users: int) -> dict:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load", "--serve", str(port), "--db", db_path],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    token = create_access_token(USERNAME)
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, headers={"Authorization": f"Bearer {token}"}) as client:
+            for _ in range(100):
+                try:
+                    if (await client.get("/health/ping")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start")
+            await _warm(client, scenarios)
+            return {name: await run_scenario(client, SCENARIOS[name], requests, users) for name in scenarios}
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def serve(port: int, db_path: str) -> None:
+    import uvicorn
+
+    use_database(db_path)
+    # Lifespan off: the schema is seeded by the parent and the background
+    # workers would otherwise probe the default database.
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+
+
+def print_report(results: dict) -> None:
+    print(f"{'transport':<10}{'scenario':<12}{'endpoint':<24}{'reqs':>7}{'errs':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for transport, scenarios in results.items():
+        for scenario, endpoints in scenarios.items():
+            for label, s in endpoints.items():
+                print(
+                    f"{transport:<10}{scenario:<12}{label:<24}{s['requests']:>7}{s['errors']:>6}"
+                    f"{s['rps']:>9.1f}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}"
+                )
+
+
+def error_regressions(current: dict, previous: dict) -> List[str]:
+    regressions = []
+    for transport, scenarios in current.items():
+        for scenario, endpoints in scenarios.items():
+            for label, s in endpoints.items():
+                old = previous.get(transport, {}).get(scenario, {}).get(label)
+                if old is not None and s["error_rate"] > old.get("error_rate", 0) + 0.01:
+                    regressions.append(
+                        f"{transport}/{scenario}/{label} error_rate: {old.get('error_rate', 0):.1%} -> {s['error_rate']:.1%}"
+                    )
+    return regressions
+
+
+async def main(args) -> int:
+    results = {}
+    for transport in args.transport:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "load.db")
+            await seed(db_path)
+            if transport == "asgi":
+                engine, _ = use_database(db_path)
+                try:
+                    results[transport] = await run_asgi(args.scenario, args.requests, args.users)
+                finally:
+                    await engine.dispose()
+            else:
+                results[transport] = await run_uvicorn(db_path, args.scenario, args.requests, args.users)
+    app.dependency_overrides.pop(get_db, None)
+
+    print_report(results)
+    if args.save:
+        baseline.save(args.save, results)
+        print(f"baseline saved to {args.save}")
+    if args.compare:
+        previous = baseline.load(args.compare)
+        regressions = baseline.compare(results, previous, CHECKS, args.tolerance) + error_regressions(results, previous)
+        if regressions:
+            print(f"regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--transport", nargs="+", choices=["asgi", "uvicorn"], default=["asgi"])
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--users", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.serve:
+        serve(args.serve, args.db)
+    else:
+        sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,156 @@
+"""Microbenchmarks for the primitives every request touches.
+
+Each case is timed in `repeat` repetitions of `number` calls after a warmup
+repetition, and reported as min and median microseconds per call. The min
+is the best estimate of the code's own cost; the median shows how noisy the
+machine was. A case's setup runs before every repetition, outside the timed
+loop.
+
+Run with:
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter token
+    python -m benchmarks.micro --save micro-baseline.json
+    python -m benchmarks.micro --compare micro-baseline.json --tolerance 0.1
+
+`--compare` exits with status 1 when any case's median is slower than the
+baseline by more than the tolerance.
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+
+from app.models.note import Note
+from app.schemas.note import NoteResponse
+from app.services.auth_service import _select_key_for_token, create_access_token, decode_token
+from app.services.user_service import pwd_context
+from app.utils.rate_limiter import RateLimiter
+from app.utils.response import success_response
+from benchmarks import baseline
+
+CHECKS = {"median_us": "lower"}
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+    repeat: int = 7
+
+
+def measure(case: Case) -> dict:
+    def run() -> float:
+        fn = case.setup()
+        start = time.perf_counter()
+        for _ in range(case.number):
+            fn()
+        return (time.perf_counter() - start) / case.number * 1e6
+
+    run()  # warmup
+    samples = [run() for _ in range(case.repeat)]
+    return {
+        "number": case.number,
+        "repeat": case.repeat,
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+    }
+
+
+def _hot_limiter():
+    limiter = RateLimiter(limit=5, window_seconds=60)
+    for _ in range(5):
+        limiter.allow("10.0.0.1")
+    return lambda: limiter.allow("10.0.0.1")
+
+
+def _cold_limiter():
+    # Every call sees a new key; the keys are built before timing starts.
+    limiter = RateLimiter(limit=5, window_seconds=60)
+    keys = iter([f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(20_000)])
+    return lambda: limiter.allow(next(keys))
+
+
+_TOKEN = create_access_token("bench@example.com")
+_NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _orm_notes(count: int = 10) -> List[Note]:
+    return [Note(id=i, title=f"note {i}", content="some note content " * 8, created_at=_NOW) for i in range(count)]
+
+
+def _validate_notes():
+    notes = _orm_notes()
+    return lambda: [NoteResponse.model_validate(n) for n in notes]
+
+
+def _success_json():
+    request = SimpleNamespace(state=SimpleNamespace(request_id=str(uuid.uuid4())))
+    data = [n.model_dump(mode="json") for n in (NoteResponse.model_validate(n) for n in _orm_notes())]
+    encoder = JSONResponse(None)
+    return lambda: encoder.render(success_response(data=data, request=request))
+
+
+def _password_hash():
+    return lambda: pwd_context.hash("Bench-Password-123")
+
+
+def _password_verify():
+    hashed = pwd_context.hash("Bench-Password-123")
+    return lambda: pwd_context.verify("Bench-Password-123", hashed)
+
+
+CASES = [
+    Case("rate_limiter.allow hot key", _hot_limiter, 20_000),
+    Case("rate_limiter.allow cold key", _cold_limiter, 20_000),
+    Case("create_access_token", lambda: lambda: create_access_token("bench@example.com"), 5_000),
+    Case("decode_token", lambda: lambda: decode_token(_TOKEN), 5_000),
+    Case("_select_key_for_token", lambda: lambda: _select_key_for_token(_TOKEN), 20_000),
+    Case("success_response + JSON (10 notes)", _success_json, 5_000),
+    Case("NoteResponse.model_validate x10", _validate_notes, 5_000),
+    Case("str(uuid4())", lambda: lambda: str(uuid.uuid4()), 50_000),
+    Case(f"pwd_context.hash ({pwd_context.scheme})", _password_hash, 3, repeat=3),
+    Case(f"pwd_context.verify ({pwd_context.scheme})", _password_verify, 3, repeat=3),
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown (default 0.1)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<42}{'calls':>8}{'min us':>12}{'median us':>12}")
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        result = results[case.name] = measure(case)
+        print(f"{case.name:<42}{case.number:>8}{result['min_us']:>12.3f}{result['median_us']:>12.3f}")
+
+    if args.save:
+        baseline.save(args.save, results)
+        print(f"baseline saved to {args.save}")
+    if args.compare:
+        regressions = baseline.compare(results, baseline.load(args.compare), CHECKS, args.tolerance)
+        if regressions:
+            print(f"regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Per-query Python overhead of the repository hot paths.
+
+Each query runs two ways against a small seeded SQLite file:
+
+    adhoc      the statement is built with select() on every call and
+               full ORM entities are loaded (how the repositories used to work)
+    prebuilt   the repository method: a module-level statement with bind
+               parameters, fetching scalars where entities are not needed
+
+The `build` cases time only constructing a statement and generating its
+cache key, which is the part a prebuilt statement skips. All figures are
+min and median microseconds per call over `--repeat` repetitions.
+
+Run with:
+
+    python -m benchmarks.queries
+    python -m benchmarks.queries --filter revoked
+    python -m benchmarks.queries --save queries-baseline.json
+    python -m benchmarks.queries --compare queries-baseline.json --tolerance 0.1
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.note import Note
+from app.models.user import RevokedToken, User
+from app.repositories.note_repository import NoteRepository
+from app.repositories.token_repository import TokenRepository
+from app.repositories.user_repository import UserRepository
+from benchmarks import baseline
+
+CHECKS = {"median_us": "lower"}
+USERNAME = "bench@example.com"
+TOKEN = "revoked-token-0"
+
+Query = Callable[[AsyncSession], Awaitable[object]]
+
+
+def _notes_page():
+    return select(Note).where(Note.user_id == 1).order_by(Note.created_at.desc(), Note.id.desc()).offset(20).limit(20)
+
+
+BUILDERS = {
+    "user by username": lambda: select(User).where(User.username == USERNAME),
+    "token revoked": lambda: select(RevokedToken).where(RevokedToken.token == TOKEN),
+    "notes page": _notes_page,
+}
+
+
+async def _adhoc_user(db):
+    return (await db.execute(select(User).where(User.username == USERNAME))).scalars().first()
+
+
+async def _adhoc_credentials(db):
+    user = (await db.execute(select(User).where(User.username == USERNAME))).scalars().first()
+    return user.hashed_password
+
+
+async def _adhoc_revoked(db):
+    return (await db.execute(select(RevokedToken).where(RevokedToken.token == TOKEN))).scalars().first() is not None
+
+
+async def _adhoc_notes(db):
+    return (await db.execute(_notes_page())).scalars().all()
+
+
+async def _prebuilt_credentials(db):
+    return (await UserRepository(db).get_credentials(USERNAME)).hashed_password
+
+
+QUERIES: Dict[str, Dict[str, Query]] = {
+    "user by username": {
+        "adhoc": _adhoc_user,
+        "prebuilt": lambda db: UserRepository(db).get_by_username(USERNAME),
+    },
+    "password hash lookup": {
+        "adhoc": _adhoc_credentials,
+        "prebuilt": _prebuilt_credentials,
+    },
+    "token revoked": {
+        "adhoc": _adhoc_revoked,
+        "prebuilt": lambda db: TokenRepository(db).is_revoked(TOKEN),
+    },
+    "notes page": {
+        "adhoc": _adhoc_notes,
+        "prebuilt": lambda db: NoteRepository.get_notes(db, 1, 20, 20),
+    },
+}
+
+
+async def seed(path: str) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(username=USERNAME, email=USERNAME, name="Bench", hashed_password="x" * 60))
+        await conn.execute(insert(RevokedToken), [{"token": f"revoked-token-{i}"} for i in range(1000)])
+        await conn.execute(
+            insert(Note), [{"title": f"note {i}", "content": "bench content " * 8, "user_id": 1} for i in range(200)]
+        )
+    await engine.dispose()
+
+
+def _summary(samples, number: int, repeat: int) -> dict:
+    return {"number": number, "repeat": repeat, "min_us": min(samples), "median_us": statistics.median(samples)}
+
+
+def measure_build(build: Callable[[], object], number: int, repeat: int) -> dict:
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            build()._generate_cache_key()
+        return (time.perf_counter() - start) / number * 1e6
+
+    run()  # warmup
+    return _summary([run() for _ in range(repeat)], number, repeat)
+
+
+async def measure_query(sessions, query: Query, number: int, repeat: int) -> dict:
+    async def run() -> float:
+        async with sessions() as db:
+            start = time.perf_counter()
+            for _ in range(number):
+                await query(db)
+                db.expunge_all()
+            return (time.perf_counter() - start) / number * 1e6
+
+    await run()  # warmup
+    return _summary([await run() for _ in range(repeat)], number, repeat)
+
+
+async def main(args) -> int:
+    results: Dict[str, dict] = {}
+    print(f"{'case':<42}{'calls':>8}{'min us':>12}{'median us':>12}")
+
+    def report(name: str, result: dict) -> None:
+        results[name] = result
+        print(f"{name:<42}{result['number']:>8}{result['min_us']:>12.2f}{result['median_us']:>12.2f}")
+
+    for name, build in BUILDERS.items():
+        if args.filter in name:
+            report(f"build: {name}", measure_build(build, args.number * 10, args.repeat))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queries.db")
+        await seed(path)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            for name, variants in QUERIES.items():
+                if args.filter not in name:
+                    continue
+                for variant, query in variants.items():
+                    report(f"{variant}: {name}", await measure_query(sessions, query, args.number, args.repeat))
+        finally:
+            await engine.dispose()
+
+    if args.save:
+        baseline.save(args.save, results)
+        print(f"baseline saved to {args.save}")
+    if args.compare:
+        regressions = baseline.compare(results, baseline.load(args.compare), CHECKS, args.tolerance)
+        if regressions:
+            print(f"regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--filter", default="", help="only run queries whose name contains this")
+    parser.add_argument("--number", type=int, default=500, help="calls per repetition")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown (default 0.1)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
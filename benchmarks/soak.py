@@ -0,0 +1,193 @@
+"""Soak test: replay a mixed, high-cardinality workload and track growth.
+
+Runs the app in process (httpx.ASGITransport) against a fresh temporary
+SQLite database for `--duration` seconds. The workload is built to touch
+everything that can grow without bound:
+
+    failed logins from ever-new client IPs   RateLimiter.store keys
+    logouts of ever-new tokens               revoked_tokens rows
+    note creates                             notes rows / DB file size
+    /protected reads and note list pages     steady-state baseline
+
+Every `--interval` seconds it samples RSS, tracemalloc's traced memory,
+the login limiter's key count and the database file size. At the end it
+fits a least-squares slope (per hour) to each series, skipping the first
+`--warmup` fraction of samples, and exits with status 1 when any slope
+exceeds its threshold. The largest tracemalloc growth sites are printed
+too.
+
+Run with:
+
+    python -m benchmarks.soak --duration 600
+    python -m benchmarks.soak --duration 3600 --threshold limiter_keys=0 --threshold rss_mb=32
+
+Thresholds are per hour: rss_mb, traced_mb, db_mb and limiter_keys.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import httpx
+
+from app.main import app
+from app.routers.auth import limiter
+from app.services.auth_service import create_access_token
+from app.services.diagnostics import memory_stats
+from benchmarks.load import PASSWORD, USERNAME, seed, use_database
+
+THRESHOLDS = {"rss_mb": 64.0, "traced_mb": 32.0, "db_mb": 256.0, "limiter_keys": 50_000.0}
+
+
+async def failed_login(client: httpx.AsyncClient, i: int) -> None:
+    await client.post(
+        "/auth/token",
+        json={"username": USERNAME, "password": "wrong-password"},
+        headers={"X-Forwarded-For": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"},
+    )
+
+
+async def logout(client: httpx.AsyncClient, i: int) -> None:
+    token = create_access_token(f"soak-{i}@example.com")
+    await client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+
+async def create_note(client: httpx.AsyncClient, i: int) -> None:
+    await client.post("/notes/", json={"title": f"soak {i}", "content": f"soak content {i} " * 6})
+
+
+async def list_notes(client: httpx.AsyncClient, i: int) -> None:
+    await client.get("/notes/", params={"skip": i % 200, "limit": 20})
+
+
+async def protected(client: httpx.AsyncClient, i: int) -> None:
+    await client.get("/protected")
+
+
+WORKLOAD = [(failed_login, 2), (logout, 1), (create_note, 2), (list_notes, 3), (protected, 4)]
+
+
+def _db_bytes(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal", f"{path}-journal") if os.path.exists(p))
+
+
+def sample(elapsed: float, db_path: str) -> dict:
+    memory = memory_stats()
+    return {
+        "t": elapsed,
+        "rss_mb": memory.get("rss_kb", memory["max_rss_kb"]) / 1024,
+        "traced_mb": tracemalloc.get_traced_memory()[0] / 2**20 if tracemalloc.is_tracing() else 0.0,
+        "db_mb": _db_bytes(db_path) / 2**20,
+        "limiter_keys": len(limiter.store),
+    }
+
+
+def slope_per_hour(points: List[tuple]) -> float:
+    """Least-squares slope of (seconds, value) points, scaled to per hour."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+
+async def soak(args, db_path: str) -> List[dict]:
+    rng = random.Random(args.seed)
+    steps = [step for step, weight in WORKLOAD for _ in range(weight)]
+    counter = iter(range(sys.maxsize))
+    deadline = time.monotonic() + args.duration
+    samples: List[dict] = []
+    token = create_access_token(USERNAME)
+
+    async def user(client):
+        for i in counter:
+            if time.monotonic() >= deadline:
+                return
+            await rng.choice(steps)(client, i)
+
+    async def sampler():
+        started = time.monotonic()
+        while True:
+            row = sample(time.monotonic() - started, db_path)
+            samples.append(row)
+            print(
+                f"{row['t']:>8.0f}s rss={row['rss_mb']:.1f}MB traced={row['traced_mb']:.1f}MB "
+                f"db={row['db_mb']:.2f}MB limiter_keys={row['limiter_keys']}",
+                flush=True,
+            )
+            if time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(min(args.interval, max(0.0, deadline - time.monotonic())))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak", headers={"Authorization": f"Bearer {token}"}) as client:
+        await asyncio.gather(sampler(), *(user(client) for _ in range(args.users)))
+    return samples
+
+
+def top_growth(first: tracemalloc.Snapshot, last: tracemalloc.Snapshot, limit: int = 10) -> None:
+    print("largest tracemalloc growth:")
+    for stat in last.compare_to(first, "lineno")[:limit]:
+        print(f"  {stat.size_diff / 1024:>+10.1f} KiB {stat.count_diff:>+8} blocks  {stat.traceback[0]}")
+
+
+async def main(args) -> int:
+    thresholds = dict(THRESHOLDS)
+    for item in args.threshold:
+        name, _, value = item.partition("=")
+        if name not in thresholds:
+            raise SystemExit(f"unknown threshold {name!r}; expected one of {', '.join(thresholds)}")
+        thresholds[name] = float(value)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "soak.db")
+        await seed(db_path, notes=200)
+        engine, _ = use_database(db_path)
+        if args.tracemalloc:
+            tracemalloc.start()
+        first = tracemalloc.take_snapshot() if args.tracemalloc else None
+        try:
+            samples = await soak(args, db_path)
+        finally:
+            await engine.dispose()
+        if first is not None:
+            top_growth(first, tracemalloc.take_snapshot())
+            tracemalloc.stop()
+
+    steady = samples[int(len(samples) * args.warmup):]
+    failed = []
+    print(f"{'series':<14}{'start':>10}{'end':>10}{'slope/h':>12}{'limit/h':>10}")
+    for name, limit in thresholds.items():
+        slope = slope_per_hour([(row["t"], row[name]) for row in steady])
+        print(f"{name:<14}{samples[0][name]:>10.2f}{samples[-1][name]:>10.2f}{slope:>12.2f}{limit:>10.2f}")
+        if slope > limit:
+            failed.append(name)
+    if failed:
+        print(f"growth above threshold: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--duration", type=float, default=300, help="seconds to run (default 300)")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between samples (default 10)")
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of samples ignored for slopes")
+    parser.add_argument("--threshold", action="append", default=[], metavar="NAME=PER_HOUR")
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false", help="skip tracemalloc (it slows the app)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,151 @@
+"""Note content storage: database size against read/write latency per codec.
+
+For each codec a fresh temporary SQLite database is filled with `--notes`
+notes of roughly `--size` bytes of word-salad text (compressible the way
+prose is), then timed on:
+
+    write      encode + INSERT, committed in batches of 100, per note
+    page       NoteRepository.get_notes (50 rows) with every content decoded
+    preview    NoteRepository.get_notes_partial (50 rows, id + content_preview)
+
+The report shows the database file size and the median of `--repeat` timed
+runs of each read at random offsets.
+
+Run with:
+
+    python -m benchmarks.storage
+    python -m benchmarks.storage --size 512 --size 8192 --codec zlib lzma
+    python -m benchmarks.storage --save storage-baseline.json
+    python -m benchmarks.storage --compare storage-baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import user  # noqa: F401  (notes.user_id references users)
+from app.models.note import Note
+from app.repositories.note_repository import NoteRepository
+from app.utils import content_codec
+from benchmarks import baseline
+
+CHECKS = {"write_us": "lower", "page_ms": "lower", "preview_ms": "lower", "db_kb": "lower"}
+WORDS = (
+    "the of and to in is that for it as with was on be by this are from at or an have not which but "
+    "note meeting draft review release backend service request latency cache index query token user "
+    "deploy rollback config schema migration session budget follow-up action owner deadline summary"
+).split()
+PAGE = 50
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+async def run_codec(path: str, codec: str, notes: int, size: int, repeat: int) -> dict:
+    rng = random.Random(size)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        start_at = datetime(2026, 1, 1)
+        texts = [_text(rng, size) for _ in range(notes)]
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            for first in range(0, notes, 100):
+                rows = [
+                    {
+                        "title": f"note {i}",
+                        "content": content_codec.encode(texts[i], codec=codec),
+                        "user_id": 1,
+                        "created_at": start_at + timedelta(seconds=i),
+                    }
+                    for i in range(first, min(first + 100, notes))
+                ]
+                await conn.execute(insert(Note.__table__), rows)
+        write_us = (time.perf_counter() - started) / notes * 1e6
+
+        page, preview = [], []
+        async with sessions() as db:
+            for _ in range(repeat):
+                skip = rng.randrange(max(1, notes - PAGE))
+                started = time.perf_counter()
+                for note in await NoteRepository.get_notes(db, 1, skip, PAGE):
+                    note.content
+                page.append((time.perf_counter() - started) * 1000)
+                db.expunge_all()
+
+                started = time.perf_counter()
+                await NoteRepository.get_notes_partial(db, 1, skip, PAGE, ("id", "content_preview"))
+                preview.append((time.perf_counter() - started) * 1000)
+    finally:
+        await engine.dispose()
+    return {
+        "db_kb": os.path.getsize(path) / 1024,
+        "write_us": write_us,
+        "page_ms": statistics.median(page),
+        "preview_ms": statistics.median(preview),
+    }
+
+
+async def main(args) -> int:
+    results = {}
+    print(f"{'size':>7}  {'codec':<6}{'db KiB':>10}{'ratio':>8}{'write us':>11}{'page ms':>10}{'preview ms':>12}")
+    for size in args.size:
+        plain_kb = None
+        for codec in args.codec:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = await run_codec(os.path.join(tmp, "storage.db"), codec, args.notes, size, args.repeat)
+            results.setdefault(str(size), {})[codec] = result
+            plain_kb = plain_kb or result["db_kb"]
+            print(
+                f"{size:>7}  {codec:<6}{result['db_kb']:>10.0f}{result['db_kb'] / plain_kb:>8.2f}"
+                f"{result['write_us']:>11.1f}{result['page_ms']:>10.2f}{result['preview_ms']:>12.2f}"
+            )
+
+    if args.save:
+        baseline.save(args.save, results)
+        print(f"baseline saved to {args.save}")
+    if args.compare:
+        regressions = baseline.compare(results, baseline.load(args.compare), CHECKS, args.tolerance)
+        if regressions:
+            print(f"regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--notes", type=int, default=2000, help="notes per database")
+    parser.add_argument("--size", type=int, nargs="+", default=[256, 2048, 16384], help="content bytes per note")
+    parser.add_argument("--codec", nargs="+", choices=["none", "zlib", "lzma"], default=["none", "zlib", "lzma"])
+    parser.add_argument("--repeat", type=int, default=50, help="timed reads per measurement")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 from httpx import AsyncClient
 from httpx import ASGITransport
@@ -14,6 +16,17 @@ async def async_client():
         yield client
 
 
+@pytest.fixture
+async def auth_headers(async_client):
+    """Register a fresh user and return its bearer Authorization header."""
+    resp = await async_client.post("/auth/register", json={
+        "email": f"user-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "StrongPass1",
+        "name": "Test User"
+    })
+    return {"Authorization": f"Bearer {resp.json()['data']['access_token']}"}
+
+
 from app.db.database import get_db
 from app.db.test_database import get_test_db, engine_test, Base
 
@@ -0,0 +1,59 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.config.settings import settings
+from app.services.user_import import import_pool
+from app.services.auth_service import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_import_requires_admin(async_client, auth_headers):
+    r = await async_client.post("/admin/users/import", content="email,password,name\n", headers={**auth_headers, "Content-Type": "text/csv"})
+    assert r.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_imports_csv_body(async_client, monkeypatch):
+    # Runs on the real process pool, which stays up across requests.
+    monkeypatch.setattr(settings, "ADMIN_SUBJECTS", ["admin@example.com"])
+    created = import_pool.created
+    headers = {"Authorization": f"Bearer {create_access_token('admin@example.com')}"}
+    email = f"imported-{uuid.uuid4().hex[:8]}@example.com"
+    body = f"email,password,name\n{email},Import123,Imported\n{email},Import123,Twice\n"
+
+    r = await async_client.post("/admin/users/import", content=body, headers={**headers, "Content-Type": "text/csv"})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert (data["inserted"], data["conflicts"], data["invalid"]) == (1, 1, 0)
+
+    r = await async_client.post("/auth/token", json={"username": email, "password": "Import123"})
+    assert r.status_code == 200
+
+    r = await async_client.post("/admin/users/import", content=body, headers=headers)
+    assert r.status_code == 415
+
+    r = await async_client.post("/admin/users/import?format=csv", content=body, headers=headers)
+    assert r.json()["data"]["conflicts"] == 2
+    assert import_pool.created == created + 1
+    await import_pool.shutdown()
+
+
+class _BrokenPool(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("a worker died")
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_discarded(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_SUBJECTS", ["admin@example.com"])
+    headers = {"Authorization": f"Bearer {create_access_token('admin@example.com')}", "Content-Type": "text/csv"}
+    broken = _BrokenPool(max_workers=1)
+    monkeypatch.setattr(import_pool, "_pool", broken)
+    body = f"email,password,name\nbroken-{uuid.uuid4().hex[:8]}@example.com,Import123,Broken\n"
+
+    r = await async_client.post("/admin/users/import", content=body, headers=headers)
+    assert r.status_code == 500
+    assert import_pool._pool is None
@@ -0,0 +1,29 @@
+import pytest
+
+from app.middleware.admission import controller
+
+
+@pytest.mark.asyncio
+async def test_saturated_group_is_shed_but_health_is_reserved(async_client, auth_headers, monkeypatch):
+    limiter = controller.limiters["notes"]
+    monkeypatch.setattr(limiter, "max_queue", 0)
+    held = 0
+    while limiter.in_flight < int(limiter.limit):
+        assert await limiter.acquire() is True
+        held += 1
+
+    try:
+        r = await async_client.get("/notes/")
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "1"
+        assert r.json()["error"] == "Service overloaded"
+        assert "X-Request-ID" in r.headers
+
+        r = await async_client.get("/health/ping")
+        assert r.status_code == 200
+    finally:
+        for _ in range(held):
+            limiter.release()
+
+    r = await async_client.get("/notes/", headers=auth_headers)
+    assert r.status_code == 200
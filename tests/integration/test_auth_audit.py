@@ -0,0 +1,40 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.db.test_database import AsyncSessionTest
+from app.models.auth_event import AuthEvent
+from app.services.audit_trail import audit_trail
+
+
+@pytest.mark.asyncio
+async def test_auth_endpoints_emit_audit_events(async_client, monkeypatch):
+    monkeypatch.setattr(audit_trail, "session_factory", AsyncSessionTest)
+    email = f"audit-{uuid.uuid4().hex[:8]}@example.com"
+
+    r = await async_client.post("/auth/register", json={"email": email, "password": "Audit1234", "name": "Audit"})
+    assert r.status_code == 200
+    r = await async_client.post(
+        "/auth/token", json={"username": email, "password": "wrong"}, headers={"X-Forwarded-For": "203.0.113.9"}
+    )
+    assert r.status_code == 401
+    r = await async_client.post(
+        "/auth/token", json={"username": email, "password": "Audit1234"}, headers={"X-Forwarded-For": "203.0.113.9"}
+    )
+    token = r.json()["data"]["access_token"]
+    r = await async_client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 204
+
+    await audit_trail.flush()
+    async with AsyncSessionTest() as session:
+        rows = (await session.execute(select(AuthEvent).where(AuthEvent.subject == email).order_by(AuthEvent.id))).scalars().all()
+
+    assert [(row.event, row.detail) for row in rows] == [
+        ("register", None),
+        ("login_failure", "invalid_credentials"),
+        ("login_success", None),
+        ("logout", None),
+    ]
+    assert rows[1].client_ip == "203.0.113.9"
+    assert all(row.request_id for row in rows)
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_notes_list_revalidates_with_etag(async_client, auth_headers):
+    r = await async_client.get("/notes/", headers=auth_headers)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert r.headers["Cache-Control"] == "private, no-cache"
+
+    r = await async_client.get("/notes/", headers={**auth_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["ETag"] == etag
+
+    # a different page has a different validator
+    r = await async_client.get("/notes/?skip=5", headers={**auth_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+
+    # a write changes the table version and so the ETag
+    await async_client.post("/notes/", json={"title": "etag", "content": "etag"}, headers=auth_headers)
+    r = await async_client.get("/notes/", headers={**auth_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_service_info_is_publicly_cacheable(async_client):
+    r = await async_client.get("/service/info")
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"] == "public, max-age=300"
+    etag = r.headers["ETag"]
+
+    r = await async_client.get("/service/info", headers={"If-None-Match": f'"other", {etag}'})
+    assert r.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_profile_not_modified(async_client):
+    resp = await async_client.post("/auth/register", json={
+        "email": "etag_user@example.com",
+        "password": "StrongPass1",
+        "name": "Etag User"
+    })
+    headers = {"Authorization": f"Bearer {resp.json()['data']['access_token']}"}
+
+    r = await async_client.get("/auth/profile", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"] == "private, no-cache"
+
+    r = await async_client.get("/auth/profile", headers={**headers, "If-None-Match": r.headers["ETag"]})
+    assert r.status_code == 304
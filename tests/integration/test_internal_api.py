@@ -0,0 +1,41 @@
+import pytest
+
+from app.config.settings import settings
+from app.services.auth_service import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_requires_auth(async_client):
+    r = await async_client.get("/internal/diagnostics")
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_internal_endpoints_require_admin(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_SUBJECTS", ["ops"])
+    headers = {"Authorization": f"Bearer {create_access_token('someone-else')}"}
+
+    r = await async_client.get("/internal/diagnostics?tracemalloc_action=start", headers=headers)
+    assert r.status_code == 403
+    assert (await async_client.get("/internal/metrics", headers=headers)).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_and_metrics(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_SUBJECTS", ["ops"])
+    headers = {"Authorization": f"Bearer {create_access_token('ops')}"}
+
+    r = await async_client.get("/internal/diagnostics?tracemalloc_action=start&top=3", headers=headers)
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert {"loop_lag", "pool", "gc", "memory", "db_probe"} <= data.keys()
+    assert data["memory"]["tracemalloc"] is True
+
+    r = await async_client.get("/internal/diagnostics?tracemalloc_action=stop", headers=headers)
+    assert r.json()["data"]["memory"]["top_allocations"] == []
+
+    r = await async_client.get("/internal/metrics", headers=headers)
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert {"admission", "diagnostics", "db_probe", "single_flight.notes_list", "sql"} <= data.keys()
+    assert "/internal/diagnostics" in data["sql"]["per_request"]
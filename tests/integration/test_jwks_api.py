@@ -0,0 +1,15 @@
+import pytest
+
+from app.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_jwks_is_cacheable(async_client):
+    r = await async_client.get("/.well-known/jwks.json")
+
+    assert r.status_code == 200
+    assert r.json() == {"keys": []}  # HS256 secrets are never published
+    assert r.headers["cache-control"] == f"public, max-age={settings.JWKS_CACHE_SECONDS}"
+
+    r2 = await async_client.get("/.well-known/jwks.json", headers={"If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 304
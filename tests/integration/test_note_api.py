@@ -1,14 +1,22 @@
 import pytest
 
+from app.services.auth_service import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_notes_require_auth(async_client):
+    assert (await async_client.get("/notes/")).status_code == 401
+    assert (await async_client.post("/notes/", json={"title": "t", "content": "c"})).status_code == 401
+
 
 @pytest.mark.asyncio
-async def test_create_note_api(async_client):
+async def test_create_note_api(async_client, auth_headers):
     payload = {
         "title": "API Note",
         "content": "API Content"
     }
 
-    response = await async_client.post("/notes/", json=payload)
+    response = await async_client.post("/notes/", json=payload, headers=auth_headers)
 
     assert response.status_code == 200
     body = response.json()
@@ -19,11 +27,40 @@ async def test_create_note_api(async_client):
 
 
 @pytest.mark.asyncio
-async def test_list_notes_api(async_client):
-    response = await async_client.get("/notes/")
+async def test_list_notes_api(async_client, auth_headers):
+    response = await async_client.get("/notes/", headers=auth_headers)
 
     assert response.status_code == 200
     body = response.json()
 
     assert body["success"] is True
     assert isinstance(body["data"], list)
+
+
+@pytest.mark.asyncio
+async def test_notes_are_scoped_to_their_owner(async_client, auth_headers):
+    for i in range(3):
+        await async_client.post("/notes/", json={"title": f"mine {i}", "content": "c"}, headers=auth_headers)
+
+    body = (await async_client.get("/notes/", headers=auth_headers)).json()
+    assert [n["title"] for n in body["data"]] == ["mine 2", "mine 1", "mine 0"]
+    note_id = body["data"][0]["id"]
+
+    r = await async_client.get(f"/notes/{note_id}", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json()["data"]["title"] == "mine 2"
+
+    other = await async_client.post("/auth/register", json={
+        "email": f"other-{note_id}@example.com",
+        "password": "StrongPass1",
+        "name": "Other"
+    })
+    other_headers = {"Authorization": f"Bearer {other.json()['data']['access_token']}"}
+    assert (await async_client.get("/notes/", headers=other_headers)).json()["data"] == []
+    assert (await async_client.get(f"/notes/{note_id}", headers=other_headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_token_for_unknown_user_cannot_use_notes(async_client):
+    headers = {"Authorization": f"Bearer {create_access_token('nobody@example.com')}"}
+    assert (await async_client.get("/notes/", headers=headers)).status_code == 401
@@ -0,0 +1,53 @@
+import pytest
+
+from app.config.settings import settings
+from app.repositories import note_repository
+
+
+async def _create(async_client, headers, n):
+    ids = []
+    for i in range(n):
+        r = await async_client.post("/notes/", json={"title": f"batch {i}", "content": "c"}, headers=headers)
+        ids.append(r.json()["data"]["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_batch_get_preserves_order_and_reports_missing(async_client, auth_headers):
+    a, b, c = await _create(async_client, auth_headers, 3)
+    missing = c + 100_000
+
+    r = await async_client.get(f"/notes/batch?ids={c},{a},{missing},{c}", headers=auth_headers)
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert [n["id"] for n in data["notes"]] == [c, a]
+    assert set(data["notes"][0]) == {"title", "content", "id", "created_at"}
+    assert data["missing"] == [missing]
+
+    r = await async_client.post("/notes/batch", json={"ids": [b, a]}, headers=auth_headers)
+    assert [n["id"] for n in r.json()["data"]["notes"]] == [b, a]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_chunked_and_scoped(async_client, auth_headers, monkeypatch):
+    monkeypatch.setattr(note_repository, "IN_CHUNK_SIZE", 2)
+    ids = await _create(async_client, auth_headers, 5)
+
+    r = await async_client.post("/notes/batch", json={"ids": ids[::-1]}, headers=auth_headers)
+    assert [n["id"] for n in r.json()["data"]["notes"]] == ids[::-1]
+
+    other = await async_client.post("/auth/register", json={
+        "email": f"batch-other-{ids[0]}@example.com", "password": "StrongPass1", "name": "Other"
+    })
+    other_headers = {"Authorization": f"Bearer {other.json()['data']['access_token']}"}
+    r = await async_client.get(f"/notes/batch?ids={ids[0]}", headers=other_headers)
+    assert r.json()["data"] == {"notes": [], "missing": [ids[0]]}
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_bad_input(async_client, auth_headers, monkeypatch):
+    assert (await async_client.get("/notes/batch?ids=1,x", headers=auth_headers)).status_code == 422
+    assert (await async_client.post("/notes/batch", json={"ids": []}, headers=auth_headers)).status_code == 422
+
+    monkeypatch.setattr(settings, "NOTES_BATCH_MAX_IDS", 2)
+    assert (await async_client.get("/notes/batch?ids=1,2,3", headers=auth_headers)).status_code == 422
@@ -0,0 +1,39 @@
+import pytest
+
+from app.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(async_client, auth_headers):
+    long_content = "x" * (settings.NOTES_PREVIEW_LENGTH + 50)
+    created = await async_client.post("/notes/", json={"title": "big", "content": long_content}, headers=auth_headers)
+    note_id = created.json()["data"]["id"]
+
+    full = (await async_client.get("/notes/", headers=auth_headers)).json()["data"][0]
+    assert list(full) == ["title", "content", "id", "created_at"]
+
+    r = await async_client.get("/notes/?fields=title,id", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json()["data"] == [{"title": "big", "id": note_id}]
+
+    r = await async_client.get("/notes/?fields=id,content_preview", headers=auth_headers)
+    item = r.json()["data"][0]
+    assert set(item) == {"id", "content_preview"}
+    assert item["content_preview"] == long_content[: settings.NOTES_PREVIEW_LENGTH]
+
+    r = await async_client.get(f"/notes/{note_id}?fields=title", headers=auth_headers)
+    assert r.json()["data"] == {"title": "big"}
+
+    # different field sets are different representations
+    etags = {
+        (await async_client.get(f"/notes/?fields={f}", headers=auth_headers)).headers["ETag"]
+        for f in ("id", "title", "")
+    }
+    assert len(etags) == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_field_is_rejected(async_client, auth_headers):
+    r = await async_client.get("/notes/?fields=id,password", headers=auth_headers)
+    assert r.status_code == 422
+    assert "password" in r.json()["detail"]
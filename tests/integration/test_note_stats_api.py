@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import update
+
+from app.db.test_database import AsyncSessionTest, TEST_DATABASE_URL
+from app.models.note_counter import NoteCounter
+from app.repositories.note_stats_repository import TOTAL, NoteStatsRepository
+from app.tools.rebuild_note_counters import rebuild
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_writes(async_client, auth_headers):
+    before = (await async_client.get("/notes/stats", headers=auth_headers)).json()["data"]
+    assert before["mine"] == 0
+
+    for i in range(3):
+        await async_client.post("/notes/", json={"title": f"count {i}", "content": "c"}, headers=auth_headers)
+
+    r = await async_client.get("/notes/?limit=2", headers=auth_headers)
+    body = r.json()
+    assert body["total"] == 3
+    assert len(body["data"]) == 2
+
+    stats = (await async_client.get("/notes/stats", headers=auth_headers)).json()["data"]
+    assert stats["mine"] == 3
+    assert stats["total"] == before["total"] + 3
+    assert sum(stats["per_day"].values()) == stats["total"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drift(async_client, auth_headers):
+    await async_client.post("/notes/", json={"title": "drift", "content": "c"}, headers=auth_headers)
+    async with AsyncSessionTest() as db:
+        expected = await NoteStatsRepository.get(db, TOTAL)
+        await db.execute(update(NoteCounter).values(count=0))
+        await db.commit()
+
+    assert await rebuild(TEST_DATABASE_URL) == expected
+    async with AsyncSessionTest() as db:
+        assert await NoteStatsRepository.get(db, TOTAL) == expected
+    mine = (await async_client.get("/notes/stats", headers=auth_headers)).json()["data"]["mine"]
+    assert mine == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from app.main import app
+from app.middleware.probes import ProbeFastPathMiddleware, ProbeTemplate
+
+PROBE_PATHS = ["/health", "/health/ping", "/health/ready", "/service/info"]
+
+
+def _fast_path():
+    layer = app.middleware_stack
+    while not isinstance(layer, ProbeFastPathMiddleware):
+        layer = layer.app
+    return layer
+
+
+def _normalize(response):
+    body = response.content.replace(response.headers["X-Request-ID"].encode(), b"<rid>")
+    headers = {k: v for k, v in response.headers.items() if k != "x-request-id"}
+    return response.status_code, body, headers
+
+
+def test_template_splices_slots():
+    template = ProbeTemplate({"a": "@x@", "b": [1, "@y@"]})
+    assert template.render({"x": "1", "y": "two"}) == b'{"a":"1","b":[1,"two"]}'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", PROBE_PATHS)
+async def test_fast_path_matches_routed_response(async_client, path):
+    fast = await async_client.get(path)
+    fast_path = _fast_path()
+    fast_path.enabled = False
+    try:
+        routed = await async_client.get(path)
+    finally:
+        fast_path.enabled = True
+
+    assert _normalize(fast) == _normalize(routed)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_live_and_conditional_info(async_client):
+    r = await async_client.get("/health/live")
+    body = r.json()
+    assert body["data"]["status"] == "live"
+    assert body["request_id"] == r.headers["X-Request-ID"]
+    assert "timestamp" in body["data"]
+
+    etag = (await async_client.get("/service/info")).headers["ETag"]
+    r = await async_client.get("/service/info", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["X-Frame-Options"] == "DENY"
+
+
+@pytest.mark.asyncio
+async def test_routed_info_goes_through_single_flight(async_client):
+    from app.services.service_info import info_flight
+
+    calls = info_flight.calls
+    fast_path = _fast_path()
+    fast_path.enabled = False
+    try:
+        r = await async_client.get("/service/info")
+    finally:
+        fast_path.enabled = True
+
+    assert r.status_code == 200
+    assert info_flight.calls == calls + 1
+    await async_client.get("/service/info")
+    assert info_flight.calls == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_ready_returns_503_when_db_probe_is_unready(async_client, monkeypatch):
+    from app.services.db_probe import db_probe
+
+    monkeypatch.setattr(db_probe, "status", lambda: {"status": "unready", "reason": "db_slow"})
+    fast = await async_client.get("/health/ready")
+    fast_path = _fast_path()
+    fast_path.enabled = False
+    try:
+        routed = await async_client.get("/health/ready")
+    finally:
+        fast_path.enabled = True
+
+    assert fast.status_code == 503
+    assert fast.json()["data"] == {"status": "unready", "reason": "db_slow"}
+    assert _normalize(fast) == _normalize(routed)
@@ -0,0 +1,56 @@
+import os
+import pstats
+
+import pytest
+from starlette.middleware import Middleware
+
+from app.config.settings import settings
+from app.main import app
+from app.middleware.profiling import ProfilingMiddleware
+from app.services.auth_service import create_access_token
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    # Off by default; install it innermost, where main.py puts it.
+    monkeypatch.setattr(settings, "ADMIN_SUBJECTS", ["profiler@example.com"])
+    previous = app.middleware_stack
+    app.user_middleware.append(Middleware(ProfilingMiddleware, directory=str(tmp_path), max_files=2))
+    app.middleware_stack = app.build_middleware_stack()
+    yield tmp_path
+    app.user_middleware.pop()
+    app.middleware_stack = previous
+
+
+ADMIN = {"Authorization": f"Bearer {create_access_token('profiler@example.com')}", "X-Profile": "1"}
+
+
+@pytest.mark.asyncio
+async def test_non_admin_requests_are_not_profiled(async_client, auth_headers, profile_dir):
+    r = await async_client.get("/notes/", headers={**auth_headers, "X-Profile": "1"})
+    assert r.status_code == 200
+    assert "server-timing" not in r.headers
+    assert "x-profile" not in r.headers
+
+    r = await async_client.get("/service/time", headers={"X-Profile": "1"})
+    assert "server-timing" not in r.headers
+    assert os.listdir(profile_dir) == []
+
+
+@pytest.mark.asyncio
+async def test_admin_request_saves_stats_and_server_timing(async_client, profile_dir):
+    r = await async_client.get("/internal/metrics", headers=ADMIN)
+    assert r.status_code == 200
+    request_id = r.headers["X-Request-ID"]
+    assert r.headers["X-Profile"] == f"{request_id}.pstats"
+    stats = pstats.Stats(str(profile_dir / f"{request_id}.pstats"))
+    assert stats.total_calls > 0
+
+    timing = dict(part.strip().split(";", 1) for part in r.headers["Server-Timing"].split(","))
+    assert set(timing) == {"db", "serialize", "total"}
+
+
+@pytest.mark.asyncio
+async def test_profile_directory_keeps_only_the_newest(async_client, profile_dir):
+    saved = [(await async_client.get("/internal/metrics", headers=ADMIN)).headers["X-Profile"] for _ in range(4)]
+    assert sorted(os.listdir(profile_dir)) == sorted(saved[-2:])
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, ConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=0)
+    assert await limiter.acquire() is True
+    assert await limiter.acquire() is False
+    assert limiter.stats()["rejected"] == 1
+
+    limiter.release()
+    assert await limiter.acquire() is True
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_times_out():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.01)
+    assert await limiter.acquire() is True
+    assert await limiter.acquire() is False
+    assert limiter.timed_out == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_hands_slot_to_waiter():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=1.0)
+    assert await limiter.acquire() is True
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    limiter.release()
+    assert await waiter is True
+    assert limiter.in_flight == 1
+
+
+def test_limiter_aimd_adapts_to_latency():
+    limiter = ConcurrencyLimiter(limit=10, target_latency=0.1)
+    for _ in range(10):
+        limiter.in_flight += 1
+        limiter.release(latency=0.5)
+    assert int(limiter.limit) < 10
+    assert limiter.limit >= limiter.min_limit
+
+    for _ in range(200):
+        limiter.in_flight += 1
+        limiter.release(latency=0.01)
+    assert int(limiter.limit) == 10
+
+
+def test_controller_groups_by_longest_prefix():
+    controller = AdmissionController(
+        limits={"health": 1, "auth": 1, "default": 1},
+        routes={"/health": "health", "/auth/token": "auth"},
+    )
+    assert controller.group_for("/health") == "health"
+    assert controller.group_for("/health/ready") == "health"
+    assert controller.group_for("/healthz") == "default"
+    assert controller.group_for("/auth/token") == "auth"
+    assert controller.group_for("/auth/profile") == "default"
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.test_database import AsyncSessionTest
+from app.models.auth_event import AuthEvent
+from app.services.audit_trail import AuditTrail
+
+
+async def _count(subject: str) -> int:
+    async with AsyncSessionTest() as session:
+        return (await session.execute(select(func.count()).where(AuthEvent.subject == subject))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting_for_interval():
+    trail = AuditTrail(AsyncSessionTest, max_queue=100, batch_size=5, flush_interval=60, enabled=True)
+    trail.start()
+    for _ in range(5):
+        trail.record("login_success", subject="batch-user")
+    for _ in range(100):
+        if trail.written == 5:
+            break
+        await asyncio.sleep(0.01)
+    await trail.stop()
+
+    assert trail.batches == 1
+    assert await _count("batch-user") == 5
+
+
+@pytest.mark.asyncio
+async def test_interval_flush_and_shutdown_flush():
+    trail = AuditTrail(AsyncSessionTest, max_queue=100, batch_size=50, flush_interval=0.05, enabled=True)
+    trail.start()
+    trail.record("logout", subject="interval-user")
+    await asyncio.sleep(0.2)
+    assert trail.written == 1
+
+    trail.record("logout", subject="interval-user")
+    await trail.stop()
+    assert await _count("interval-user") == 2
+    assert trail.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_during_a_write_loses_nothing():
+    writing = asyncio.Event()
+
+    class SlowSession:
+        def __init__(self):
+            self.session = AsyncSessionTest()
+
+        async def __aenter__(self):
+            writing.set()
+            await asyncio.sleep(0.05)
+            return await self.session.__aenter__()
+
+        async def __aexit__(self, *exc):
+            return await self.session.__aexit__(*exc)
+
+    trail = AuditTrail(SlowSession, max_queue=100, batch_size=3, flush_interval=60, enabled=True)
+    trail.start()
+    for _ in range(3):
+        trail.record("login_failure", subject="stop-user")
+    await writing.wait()
+    await trail.stop()
+
+    assert trail.stats()["written"] == 3 and trail.failed == 0
+    assert await _count("stop-user") == 3
+
+
+def test_overflow_is_counted_and_disabled_trail_records_nothing():
+    trail = AuditTrail(AsyncSessionTest, max_queue=2, batch_size=10, flush_interval=1, enabled=True)
+    assert [trail.record("register") for _ in range(3)] == [True, True, False]
+    assert trail.stats()["overflow"] == 1
+
+    disabled = AuditTrail(AsyncSessionTest, enabled=False)
+    assert disabled.record("register") is False
+    assert disabled.stats()["queued"] == 0
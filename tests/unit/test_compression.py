@@ -0,0 +1,102 @@
+import gzip
+import itertools
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.compression import CompressionMiddleware, StaticBodyCache, negotiate_encoding
+
+
+async def big(request):
+    return JSONResponse({"items": ["note content " * 10] * 50})
+
+
+async def small(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(5):
+            yield (f"line {i} " * 200).encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+_ids = itertools.cycle("abcdefgh")
+
+
+async def static(request):
+    return JSONResponse({"data": "x" * 600, "request_id": next(_ids) * 8})
+
+
+def _client(cache=None):
+    app = Starlette(routes=[Route("/big", big), Route("/small", small), Route("/stream", stream), Route("/static", static)])
+    wrapped = CompressionMiddleware(app, minimum_size=500, static_paths=("/static",), cache=cache or StaticBodyCache())
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+def test_negotiate_encoding_respects_q_values():
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") is not None
+    assert negotiate_encoding("") is None
+
+
+@pytest.mark.asyncio
+async def test_large_body_is_gzipped_and_small_is_not():
+    async with _client() as client:
+        r = await client.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["Content-Encoding"] == "gzip"
+        assert int(r.headers["Content-Length"]) < len(r.content)
+        assert "Accept-Encoding" in r.headers["Vary"]
+        assert len(r.json()["items"]) == 50
+
+        r = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in r.headers
+
+        r = await client.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_per_chunk():
+    async with _client() as client:
+        r = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in r.headers
+        assert r.text.startswith("line 0 ")
+        assert r.text.count("line 4") == 200
+
+
+@pytest.mark.asyncio
+async def test_static_path_reuses_compressed_prefix():
+    cache = StaticBodyCache()
+    async with _client(cache) as client:
+        bodies = []
+        for _ in range(4):
+            r = await client.get("/static", headers={"Accept-Encoding": "gzip"})
+            assert r.headers["Content-Encoding"] == "gzip"
+            bodies.append(r.json())
+
+    assert cache.stats()["hits"] == 2
+    assert len({b["request_id"] for b in bodies}) == 4
+
+
+def test_static_cache_output_is_valid_gzip():
+    cache = StaticBodyCache()
+    for tail in (b"aaa", b"bbb", b"ccc"):
+        body = b'{"constant":"' + b"x" * 100 + b'","id":"' + tail + b'"}'
+        assert gzip.decompress(cache.compress("/p", "gzip", body, 6)) == body
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_small_bodies_through_app_stack_are_not_compressed(async_client):
+    # Inner BaseHTTPMiddleware layers re-stream bodies; the size must still count.
+    r = await async_client.get("/health/ping", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
@@ -0,0 +1,51 @@
+import pytest
+
+from app.utils import content_codec
+
+
+TEXT = "meeting notes: review the release checklist and owners. " * 60
+
+
+@pytest.mark.parametrize("codec, version", [("zlib", content_codec.ZLIB), ("lzma", content_codec.LZMA)])
+def test_large_content_round_trips_compressed(codec, version):
+    stored = content_codec.encode(TEXT, codec=codec, min_bytes=1024)
+
+    assert isinstance(stored, bytes)
+    assert stored[0] == version
+    assert len(stored) < len(TEXT)
+    assert content_codec.decode(stored) == TEXT
+
+
+def test_small_or_disabled_content_stays_text():
+    assert content_codec.encode("short", codec="zlib", min_bytes=1024) == "short"
+    assert content_codec.encode(TEXT, codec="none", min_bytes=0) == TEXT
+    assert content_codec.decode("plain") == "plain"
+
+
+def test_incompressible_content_stays_text():
+    # Level 0 only wraps the data, so the "compressed" value is the larger one.
+    stored = content_codec.encode(TEXT, codec="zlib", min_bytes=0, level=0)
+    assert stored == TEXT
+
+
+def test_decode_prefix_only_returns_requested_characters():
+    text = "é" * 3000
+    stored = content_codec.encode(text, codec="zlib", min_bytes=0)
+
+    assert content_codec.decode_prefix(stored, 10) == "é" * 10
+    assert content_codec.decode_prefix("plain text", 5) == "plain"
+
+
+def test_unknown_version_byte_is_rejected():
+    with pytest.raises(ValueError):
+        content_codec.decode(b"\x7fgarbage")
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_prefix_decodes_from_truncated_stored_value(codec):
+    # Incompressible 4-byte characters up front, so the prefix is the costliest case.
+    text = "".join(chr(0x1F300 + (i * 7919) % 700) for i in range(400)) + TEXT * 4
+    stored = content_codec.encode(text, codec=codec, min_bytes=0)
+
+    assert isinstance(stored, bytes)
+    assert content_codec.decode_prefix(stored[:content_codec.prefix_bytes(200)], 200) == text[:200]
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.test_database import engine_test
+from app.services.db_probe import DatabaseProbe
+from app.services.health_service import HealthService
+
+
+@pytest.mark.asyncio
+async def test_probe_records_latency_and_pool_stats():
+    probe = DatabaseProbe(engine_test, interval=60, timeout=5)
+    await probe.check()
+
+    assert probe.ok is True
+    assert probe.latency_ms is not None and probe.checkout_ms is not None
+    assert "checked_out" in probe.pool
+    assert probe.unready_reason() is None
+
+
+@pytest.mark.asyncio
+async def test_probe_flags_unreachable_database():
+    broken = create_async_engine("sqlite+aiosqlite:////nonexistent-dir/x.db")
+    probe = DatabaseProbe(broken, interval=60, timeout=5)
+    await probe.check()
+    await broken.dispose()
+
+    assert probe.ok is False
+    assert probe.unready_reason() == "db_unreachable"
+
+
+@pytest.mark.asyncio
+async def test_running_probe_turns_unready_over_thresholds():
+    probe = DatabaseProbe(engine_test, interval=60, timeout=5, max_latency_ms=0, max_checkout_ms=10_000)
+    service = HealthService(probe)
+    # not started: legacy always-ready behaviour
+    assert (await service.ready())["status"] == "ready"
+
+    await probe.start()
+    try:
+        result = await service.ready()
+        assert result == {"status": "unready", "reason": "db_slow"}
+    finally:
+        await probe.stop()
+    assert not probe.running
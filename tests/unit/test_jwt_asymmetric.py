@@ -0,0 +1,63 @@
+import json
+import sys
+
+import jwt
+import pytest
+
+from app.config.settings import settings
+from app.services import jwt_keys
+from app.services.auth_service import create_access_token, decode_token
+
+serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa  # noqa: E402
+
+
+def _pem(key) -> str:
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+def _use(monkeypatch, algorithm, keys, active):
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", algorithm)
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEYS", keys)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEYS", {})
+    monkeypatch.setattr(settings, "ACTIVE_KEY_ID", active)
+
+
+@pytest.mark.parametrize("algorithm, generate", [
+    ("EdDSA", ed25519.Ed25519PrivateKey.generate),
+    ("RS256", lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+])
+def test_tokens_verify_against_published_jwks(monkeypatch, algorithm, generate):
+    _use(monkeypatch, algorithm, {"k1": _pem(generate())}, "k1")
+
+    token = create_access_token("carol")
+    jwks = json.loads(jwt_keys.current().jwks)
+
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert decode_token(token)["sub"] == "carol"
+    # A downstream service needs only the JWKS, no shared secret.
+    public = jwt.PyJWK(jwks["keys"][0]).key
+    payload = jwt.decode(token, public, algorithms=[algorithm], audience=settings.JWT_AUDIENCE)
+    assert payload["sub"] == "carol"
+    assert "d" not in jwks["keys"][0]
+
+
+def test_rotation_keeps_old_tokens_valid(monkeypatch):
+    old, new = _pem(ed25519.Ed25519PrivateKey.generate()), _pem(ed25519.Ed25519PrivateKey.generate())
+    _use(monkeypatch, "EdDSA", {"old": old}, "old")
+    old_token = create_access_token("dave")
+
+    _use(monkeypatch, "EdDSA", {"old": old, "new": new}, "new")
+    new_token = create_access_token("dave")
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert decode_token(old_token)["sub"] == decode_token(new_token)["sub"] == "dave"
+    assert {k["kid"] for k in json.loads(jwt_keys.current().jwks)["keys"]} == {"old", "new"}
+
+
+def test_missing_cryptography_is_reported_clearly(monkeypatch):
+    monkeypatch.setitem(sys.modules, "cryptography.hazmat.primitives", None)
+    with pytest.raises(RuntimeError, match="needs the `cryptography` package"):
+        jwt_keys._build("EdDSA", (("missing-crypto", "unused.pem"),), ())
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.services.loop_watchdog import LoopWatchdog
+
+
+def _blocking_handler(request: Request):
+    time.sleep(0.15)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_names_blocking_site_and_request(caplog):
+    watchdog = LoopWatchdog(threshold_ms=30)
+    request = Request({"type": "http", "path": "/slow", "headers": [], "state": {"request_id": "rid-123"}})
+
+    caplog.set_level(logging.WARNING, logger="app.services.loop_watchdog")
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.02)
+        _blocking_handler(request)
+        await asyncio.sleep(0.05)
+    finally:
+        await watchdog.stop()
+
+    stats = watchdog.stats()
+    assert stats["stalls"] == 1
+    (site, entry), = stats["sites"].items()
+    assert "test_loop_watchdog.py" in site and "_blocking_handler" in site
+    assert entry["routes"] == {"/slow": 1}
+    assert entry["max_ms"] >= 100
+    assert "request_id=rid-123" in caplog.text
+    assert "time.sleep" in caplog.text or "_blocking_handler" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_watchdog_is_quiet_without_stalls():
+    watchdog = LoopWatchdog(threshold_ms=50)
+    watchdog.start()
+    watchdog.start()  # idempotent
+    await asyncio.sleep(0.1)
+    await watchdog.stop()
+    assert watchdog.stats()["stalls"] == 0
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import user  # noqa: F401  (notes.user_id references users)
+from app.models.note import ArchivedNote, Note
+from app.repositories.note_repository import NoteRepository
+from app.repositories.note_stats_repository import TOTAL, NoteStatsRepository
+from app.services.note_archiver import NoteArchiver
+
+NOW = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'archive.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(sessions, ages_in_days):
+    async with sessions() as db:
+        db.add_all(
+            Note(title=f"note {i}", content=f"body {i}", user_id=1, created_at=NOW - timedelta(days=age))
+            for i, age in enumerate(ages_in_days, start=1)
+        )
+        await db.commit()
+
+
+async def _count(db, model):
+    return (await db.execute(select(func.count(model.id)))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_old_notes_move_in_batches_and_reads_fall_back(sessions):
+    await _seed(sessions, [400, 390, 380, 370, 360, 10, 1])
+    archiver = NoteArchiver(session_factory=sessions, max_age_days=30, batch_size=2, pause=0)
+
+    assert await archiver.run_once(now=NOW) == 5
+    assert archiver.stats()["batches"] == 3
+
+    async with sessions() as db:
+        assert (await _count(db, Note), await _count(db, ArchivedNote)) == (2, 5)
+        assert [n.id for n in await NoteRepository.get_notes(db, 1, 0, 10)] == [7, 6, 5, 4, 3, 2, 1]
+        assert [n.id for n in await NoteRepository.get_notes(db, 1, 1, 3)] == [6, 5, 4]
+        assert [n.id for n in await NoteRepository.get_notes(db, 1, 3, 2)] == [4, 3]
+        partial = await NoteRepository.get_notes_partial(db, 1, 5, 5, ("id", "content_preview"))
+        assert partial == [{"id": 2, "content_preview": "body 2"}, {"id": 1, "content_preview": "body 1"}]
+        assert (await NoteRepository.get_note(db, 1, 2)).content == "body 2"
+        assert (await NoteRepository.get_note_partial(db, 1, 1, ("title",))) == {"title": "note 1"}
+        assert await NoteRepository.get_note(db, 2, 2) is None
+        assert sorted(n.id for n in await NoteRepository.get_notes_by_ids(db, 1, [7, 1, 99])) == [1, 7]
+        assert await NoteRepository.get_version(db, 1) == 7
+        assert await NoteStatsRepository.rebuild(db) == 7
+        assert await NoteStatsRepository.get(db, TOTAL) == 7
+
+
+@pytest.mark.asyncio
+async def test_newest_note_stays_hot_so_ids_are_never_reused(sessions):
+    await _seed(sessions, [400, 300, 200])
+    archiver = NoteArchiver(session_factory=sessions, max_age_days=30, batch_size=10, pause=0)
+
+    assert await archiver.run_once(now=NOW) == 2
+    async with sessions() as db:
+        note = await NoteRepository().create(db, title="new", content="fresh", user_id=1)
+        assert note.id == 4
+        assert [n.id for n in await NoteRepository.get_notes(db, 1, 0, 10)] == [4, 3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_notes_without_created_at_do_not_block_archival(sessions):
+    await _seed(sessions, [400, 390])
+    async with sessions() as db:
+        db.add(Note(title="legacy", content="no date", user_id=1))
+        await db.flush()
+        await db.execute(Note.__table__.update().where(Note.id == 3).values(created_at=None))
+        await db.commit()
+    await _seed(sessions, [380, 1])
+    archiver = NoteArchiver(session_factory=sessions, max_age_days=30, batch_size=1, pause=0)
+
+    assert await archiver.run_once(now=NOW) == 3
+    async with sessions() as db:
+        assert [n.id for n in (await db.execute(select(Note))).scalars()] == [3, 5]
+        assert await _count(db, ArchivedNote) == 3
+
+
+@pytest.mark.asyncio
+async def test_reads_stay_consistent_while_batches_commit(sessions):
+    await _seed(sessions, [400] * 30 + [1])
+    archiver = NoteArchiver(session_factory=sessions, max_age_days=30, batch_size=1, pause=0)
+    expected = list(range(31, 0, -1))
+
+    async def read():
+        pages, found = [], []
+        async with sessions() as db:
+            while await _count(db, Note) > 1:
+                pages.append([n.id for n in await NoteRepository.get_notes(db, 1, 0, 50)])
+                found.append(len(await NoteRepository.get_notes_by_ids(db, 1, expected)))
+        return pages, found
+
+    pages, found = (await asyncio.gather(read(), archiver.run_once(now=NOW)))[0]
+
+    assert archiver.archived == 30
+    assert pages and all(page == expected for page in pages)
+    assert set(found) == {31}
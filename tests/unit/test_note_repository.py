@@ -1,6 +1,11 @@
 import pytest
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.repositories.note_repository import NoteRepository
+from app.config.settings import settings
+from app.models.note import Note
+from app.repositories.note_repository import NOTE_COLUMNS, NoteRepository
+from app.tools.recompress_notes import recompress
+from app.utils import content_codec
 from app.db.test_database import AsyncSessionTest
 
 
@@ -18,3 +23,69 @@ async def test_create_note_repository():
         assert note.id is not None
         assert note.title == "Test title"
         assert note.content == "Test content"
+
+
+@pytest.mark.asyncio
+async def test_scoped_listing_uses_owner_index():
+    async with AsyncSessionTest() as db:
+        plan = await db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM notes WHERE user_id = 1 "
+            "ORDER BY created_at DESC, id DESC LIMIT 10"
+        ))
+        details = " ".join(row[-1] for row in plan)
+
+    assert "ix_notes_user_created_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.asyncio
+async def test_large_content_is_stored_compressed_and_decoded_on_read():
+    content = "compressible note body " * 200
+    async with AsyncSessionTest() as db:
+        note = await NoteRepository().create(db, title="Big", content=content, user_id=4242)
+        stored = (await db.execute(text("SELECT typeof(content) FROM notes WHERE id = :id"), {"id": note.id})).scalar()
+        db.expunge_all()
+
+        loaded = await NoteRepository.get_note(db, 4242, note.id)
+        partial = await NoteRepository.get_note_partial(db, 4242, note.id, ("content", "content_preview"))
+
+    assert stored == "blob"
+    assert loaded.content == content
+    assert partial["content"] == content
+    assert partial["content_preview"] == content[:settings.NOTES_PREVIEW_LENGTH]
+
+
+@pytest.mark.asyncio
+async def test_compressed_preview_reads_only_a_prefix():
+    content = "".join(f"line {i}: {i * 7919 % 100003}\n" for i in range(20000))
+    async with AsyncSessionTest() as db:
+        note = await NoteRepository().create(db, title="Huge", content=content, user_id=4243)
+        stored = (await db.execute(select(NOTE_COLUMNS["content_preview"]).where(Note.id == note.id))).scalar()
+        partial = await NoteRepository.get_note_partial(db, 4243, note.id, ("content_preview",))
+
+    assert isinstance(stored, bytes)
+    assert len(stored) == content_codec.prefix_bytes(settings.NOTES_PREVIEW_LENGTH)
+    assert partial["content_preview"] == content[:settings.NOTES_PREVIEW_LENGTH]
+
+
+@pytest.mark.asyncio
+async def test_recompress_rewrites_plain_rows():
+    content = "written before compression existed " * 100
+    async with AsyncSessionTest() as db:
+        result = await db.execute(
+            text("INSERT INTO notes (title, content, user_id) VALUES ('old', :content, 4243) RETURNING id"),
+            {"content": content},
+        )
+        note_id = result.scalar()
+        await db.commit()
+
+        report = await recompress(db, codec="zlib", min_bytes=1024)
+        again = await recompress(db, codec="zlib", min_bytes=1024)
+        stored = (await db.execute(text("SELECT typeof(content) FROM notes WHERE id = :id"), {"id": note_id})).scalar()
+        note = await NoteRepository.get_note(db, 4243, note_id)
+
+    assert report["rewritten"] >= 1
+    assert report["bytes_after"] < report["bytes_before"]
+    assert again["rewritten"] == 0
+    assert stored == "blob"
+    assert note.content == content
@@ -1,4 +1,11 @@
-from app.services.user_service import pwd_context
+import uuid
+
+import pytest
+
+from app.db.test_database import AsyncSessionTest
+from app.repositories.user_repository import UserRepository
+from app.services.password_rehash import password_rehasher
+from app.services.user_service import UserService, _context, calibrate_rounds, pwd_context
 
 
 def test_password_hash_and_verify():
@@ -7,3 +14,53 @@ def test_password_hash_and_verify():
     assert hashed != password
     assert pwd_context.verify(password, hashed) is True
     assert pwd_context.verify("wrong", hashed) is False
+
+
+def test_hash_at_another_cost_needs_update():
+    other = _context(pwd_context.scheme, 1000 if pwd_context.scheme == "sha256_crypt" else 4)
+    assert pwd_context.needs_update(other.hash("Str0ngPass")) is True
+    assert pwd_context.needs_update(pwd_context.hash("Str0ngPass")) is False
+
+
+def test_calibration_stays_within_target():
+    rounds, elapsed = calibrate_rounds(20, samples=1)
+    assert rounds >= 1000 if pwd_context.scheme == "sha256_crypt" else rounds >= 4
+    assert elapsed < 60
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_hash_in_background(monkeypatch):
+    monkeypatch.setattr(password_rehasher, "session_factory", AsyncSessionTest)
+    monkeypatch.setattr(password_rehasher, "enabled", True)
+    email = f"rehash-{uuid.uuid4().hex[:8]}@example.com"
+    cheap = _context(pwd_context.scheme, 1000 if pwd_context.scheme == "sha256_crypt" else 4)
+    async with AsyncSessionTest() as db:
+        await UserRepository(db).create_user(email, email, None, cheap.hash("Str0ngPass"))
+        assert await UserService(db).authenticate(email, "Str0ngPass") is True
+
+    await password_rehasher.drain()
+    async with AsyncSessionTest() as db:
+        stored = (await UserRepository(db).get_credentials(email)).hashed_password
+        assert await UserService(db).authenticate(email, "Str0ngPass") is True
+
+    assert not pwd_context.needs_update(stored)
+    assert password_rehasher.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_long_password_still_logs_in_after_rehash(monkeypatch):
+    monkeypatch.setattr(password_rehasher, "session_factory", AsyncSessionTest)
+    monkeypatch.setattr(password_rehasher, "enabled", True)
+    email = f"rehash-long-{uuid.uuid4().hex[:8]}@example.com"
+    password = "Str0ngPass-" + "y" * 69  # 80 bytes
+    cheap = _context(pwd_context.scheme, 1000 if pwd_context.scheme == "sha256_crypt" else 4)
+    async with AsyncSessionTest() as db:
+        # As registration stored it: hashed from the first 72 bytes.
+        await UserRepository(db).create_user(email, email, None, cheap.hash(password[:72]))
+        assert await UserService(db).authenticate(email, password) is True
+
+    await password_rehasher.drain()
+    async with AsyncSessionTest() as db:
+        stored = (await UserRepository(db).get_credentials(email)).hashed_password
+        assert not pwd_context.needs_update(stored)
+        assert await UserService(db).authenticate(email, password) is True
@@ -0,0 +1,28 @@
+import pytest
+
+from app import __main__ as cli
+from app.db.test_database import engine_test
+from app.services.prewarm import prewarm
+
+
+def test_server_options_follow_settings_and_flags(monkeypatch):
+    monkeypatch.setattr(cli, "_installed", lambda module: module == "uvloop")
+    options = cli.server_options(cli.parse_args(["--workers", "4", "--keepalive", "15"]))
+
+    assert options["workers"] == 4
+    assert options["timeout_keep_alive"] == 15
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "h11"
+    assert options["lifespan"] == "on"
+
+
+def test_explicit_implementation_is_kept(monkeypatch):
+    monkeypatch.setattr(cli, "_installed", lambda module: True)
+    assert cli.resolve_loop("asyncio") == "asyncio"
+    assert cli.resolve_http("auto") == "httptools"
+
+
+@pytest.mark.asyncio
+async def test_prewarm_reports_timings():
+    timings = await prewarm(engine_test)
+    assert set(timings) == {"db_connect_ms", "crypto_ms"}
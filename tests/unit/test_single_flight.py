@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert runs == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight(ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def ok():
+        return 1
+
+    assert await flight.do("k", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_serves_cached_result_until_invalidated():
+    flight = SingleFlight(ttl=60)
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        return runs
+
+    assert await flight.do("k", work) == 1
+    assert await flight.do("k", work) == 1
+    assert flight.cache_hits == 1
+
+    flight.invalidate()
+    assert await flight.do("k", work) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return runs
+
+    leader = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == [2, 2, 2]
+    assert leader.cancelled()
+    assert runs == 2
+
+
+@pytest.mark.asyncio
+async def test_call_in_flight_during_invalidate_is_not_cached():
+    flight = SingleFlight(ttl=60)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    stale = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    flight.invalidate()
+    release.set()
+    assert await stale == "stale"
+
+    async def fresh():
+        return "fresh"
+
+    assert await flight.do("k", fresh) == "fresh"
@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import instrumentation
+from app.db.instrumentation import QueryStats, fingerprint, instrument_engine
+from app.utils import request_context
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    a = fingerprint("SELECT * FROM notes\n  WHERE id IN (?, ?, ?) AND title = 'x' LIMIT 10")
+    b = fingerprint("SELECT * FROM notes WHERE id IN (?, ?) AND title = 'it''s' LIMIT 20")
+    assert a == b == "SELECT * FROM notes WHERE id IN (?, ...) AND title = ? LIMIT ?"
+
+
+def test_statement_histogram_and_cap():
+    stats = QueryStats(slow_ms=50, max_fingerprints=1)
+    stats.record_statement("SELECT 1", 0.5)
+    stats.record_statement("SELECT 2", 7.0)
+    stats.record_statement("SELECT 3 FROM t", 60.0)
+    out = stats.stats()
+    assert out["slow_queries"] == 1
+    entry = out["statements"]["SELECT ?"]
+    assert entry["count"] == 2
+    assert entry["buckets"][0] == 1 and entry["buckets"][2] == 1
+    assert out["statements"]["<other>"]["count"] == 1
+
+
+def test_requests_over_query_limit_are_logged(caplog):
+    stats = QueryStats(max_queries_per_request=2)
+    stats.record_request("/auth/profile", 2)
+    with caplog.at_level(logging.WARNING):
+        stats.record_request("/auth/profile", 3, "rid-1")
+    entry = stats.stats()["per_request"]["/auth/profile"]
+    assert entry == {"requests": 2, "queries": 5, "max_queries": 3, "over_limit": 1, "avg_queries": 2.5}
+    assert "rid-1" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_engine_events_feed_request_context_and_slow_log(monkeypatch, caplog):
+    stats = QueryStats(slow_ms=0, explain_slow=True)
+    monkeypatch.setattr(instrumentation, "query_stats", stats)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+
+    token = request_context.begin("rid-2", "/x")
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            async with engine.connect() as conn:
+                await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+                await conn.execute(text("SELECT id FROM t WHERE id = :id"), {"id": 1})
+        ctx = request_context.current()
+    finally:
+        request_context.end(token)
+    await engine.dispose()
+
+    assert ctx.db_queries == 2 and ctx.db_time > 0
+    assert stats.stats()["statements"]["SELECT id FROM t WHERE id = ?"]["count"] == 1
+    assert "request_id=rid-2" in caplog.text
+    assert "plan: SEARCH t USING INTEGER PRIMARY KEY" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_do_not_leak_start_times(monkeypatch):
+    monkeypatch.setattr(instrumentation, "query_stats", QueryStats())
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing"))
+        await conn.execute(text("SELECT 1"))
+        starts = (await conn.get_raw_connection()).info["query_start"]
+    await engine.dispose()
+
+    assert starts == []
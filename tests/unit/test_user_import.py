@@ -0,0 +1,92 @@
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.db.test_database import AsyncSessionTest
+from app.repositories.user_repository import UserRepository
+from app.services.user_import import import_users, iter_body_lines, iter_lines
+from app.services.user_service import UserService, pwd_context
+
+
+async def _run(lines, fmt, chunk_size=2):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        async with AsyncSessionTest() as db:
+            return await import_users(db, iter_lines(lines), fmt, pool, chunk_size=chunk_size)
+
+
+@pytest.mark.asyncio
+async def test_csv_import_inserts_and_reports_conflicts_and_invalid_rows():
+    suffix = uuid.uuid4().hex[:8]
+    a, b = f"a-{suffix}@example.com", f"b-{suffix}@example.com"
+    async with AsyncSessionTest() as db:
+        await UserRepository(db).create_user(b, b, "Existing", "hash")
+
+    report = await _run(
+        [
+            "email,password,name\n",
+            f"{a},Import123,Alice\n",
+            f"{b},Import123,Bob\n",
+            "not-an-email,Import123,Nobody\n",
+            f"{a},Import123,Alice again\n",
+        ],
+        "csv",
+    )
+
+    assert (report.inserted, report.conflicts, report.invalid) == (1, 2, 1)
+    assert report.conflicting_emails == [b, a]
+    assert report.errors[0]["line"] == 4
+    async with AsyncSessionTest() as db:
+        credentials = await UserRepository(db).get_credentials(a)
+    assert pwd_context.verify("Import123", credentials.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_import_reports_bad_json():
+    email = f"n-{uuid.uuid4().hex[:8]}@example.com"
+    report = await _run([json.dumps({"email": email, "password": "Import123", "name": "Nd"}), "{oops"], "ndjson")
+
+    assert (report.inserted, report.invalid) == (1, 1)
+    assert report.errors[0]["line"] == 2
+
+
+@pytest.mark.asyncio
+async def test_body_lines_split_across_chunks():
+    async def chunks():
+        for part in (b"first li", b"ne\nsec", "ond é".encode()[:-1], "ond é".encode()[-1:], b"\n"):
+            yield part
+
+    assert [line async for line in iter_body_lines(chunks())] == ["first line", "second é"]
+
+
+@pytest.mark.asyncio
+async def test_imported_long_password_logs_in_like_a_registered_one():
+    email = f"long-{uuid.uuid4().hex[:8]}@example.com"
+    password = "Long-Passw0rd-" + "x" * 66  # 80 bytes, past bcrypt's 72
+    report = await _run(["email,password,name\n", f"{email},{password},Long\n"], "csv")
+
+    assert report.inserted == 1
+    async with AsyncSessionTest() as db:
+        assert await UserService(db).authenticate(email, password)
+
+
+@pytest.mark.asyncio
+async def test_quoted_csv_fields_may_span_lines():
+    suffix = uuid.uuid4().hex[:8]
+    a, b = f"ml-a-{suffix}@example.com", f"ml-b-{suffix}@example.com"
+    report = await _run(
+        [
+            "email,password,name\n",
+            f'{a},Import123,"Ann\n',
+            'Lee"\n',
+            f"{b},Import123,Bob\n",
+            f'x-{suffix}@example.com,Import123,"never closed\n',
+        ],
+        "csv",
+    )
+
+    assert (report.inserted, report.invalid) == (2, 1)
+    assert report.errors == [{"line": 5, "error": "unterminated quoted field"}]
+    async with AsyncSessionTest() as db:
+        assert (await UserRepository(db).get_profile(a)).name == "Ann\nLee"
@@ -0,0 +1,39 @@
+import uuid
+
+import pytest
+
+from app.db.test_database import AsyncSessionTest
+from app.repositories.token_repository import TokenRepository
+from app.repositories.user_repository import UserRepository
+
+
+@pytest.mark.asyncio
+async def test_lookups_prefer_username_over_email():
+    suffix = uuid.uuid4().hex[:8]
+    shared = f"shared-{suffix}@example.com"
+    async with AsyncSessionTest() as db:
+        repo = UserRepository(db)
+        by_email = await repo.create_user(f"other-{suffix}", shared, "By Email", "hash-email")
+        by_name = await repo.create_user(shared, f"named-{suffix}@example.com", "By Name", "hash-name")
+
+        credentials = await repo.get_credentials(shared)
+        profile = await repo.get_profile(shared)
+        missing = await repo.get_credentials(f"nobody-{suffix}")
+
+    assert (credentials.id, credentials.hashed_password) == (by_name.id, "hash-name")
+    assert profile.name == "By Name"
+    assert by_email.id != by_name.id
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_existence_checks_do_not_need_entities():
+    suffix = uuid.uuid4().hex[:8]
+    async with AsyncSessionTest() as db:
+        await UserRepository(db).create_user(f"u-{suffix}", f"u-{suffix}@example.com", None, "hash")
+        await TokenRepository(db).add_revoked(f"token-{suffix}")
+
+        assert await UserRepository(db).email_exists(f"u-{suffix}@example.com")
+        assert not await UserRepository(db).email_exists(f"nobody-{suffix}@example.com")
+        assert await TokenRepository(db).is_revoked(f"token-{suffix}")
+        assert not await TokenRepository(db).is_revoked(f"other-{suffix}")